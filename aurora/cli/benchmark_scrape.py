@@ -0,0 +1,101 @@
+"""
+Django manage interface for timing the parsing of saved aurora/banner pages.
+"""
+#########################################################################
+#######################
+from __future__ import print_function, unicode_literals
+
+import os
+import timeit
+
+from lxml import etree as ETree
+
+from ..utils import aurora_scrape
+
+#######################
+
+#########################################################################
+
+DJANGO_COMMAND = "main"  # enable this is a CLI command
+USE_ARGPARSE = True
+OPTION_LIST = (
+    (
+        ["--repeat"],
+        {"type": int, "default": 5, "help": "Number of timed runs (default: 5)"},
+    ),
+    (
+        ["page"],
+        {
+            "nargs": "+",
+            "help": "Saved course list pages, or directories of them (e.g., from load_classes --record)",
+        },
+    ),
+)
+HELP_TEXT = "Compare the full and incremental banner course list parsers"
+
+#########################################################################
+
+
+def _page_list(path_list):
+    for path in path_list:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".html"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def _first(iterable):
+    for item in iterable:
+        return item
+
+
+def main(options, args):
+    verbosity = int(options["verbosity"])
+    repeat = options["repeat"]
+
+    def _time(func):
+        return min(timeit.repeat(func, number=1, repeat=repeat))
+
+    totals = [0.0, 0.0, 0.0]
+    for path in _page_list(options["page"]):
+        with open(path, "rb") as f:
+            page = f.read()
+        try:
+            expected = aurora_scrape.scrape_page(ETree.HTML(page))
+        except AssertionError:
+            if verbosity > 1:
+                print("{0}: not a course list, skipped".format(path))
+            continue
+        if not expected:
+            continue
+        assert (
+            list(aurora_scrape.iter_scrape_page(page)) == expected
+        ), "{0}: the parsers disagree!".format(path)
+
+        full = _time(lambda: aurora_scrape.scrape_page(ETree.HTML(page)))
+        incremental = _time(lambda: list(aurora_scrape.iter_scrape_page(page)))
+        first = _time(lambda: _first(aurora_scrape.iter_scrape_page(page)))
+        totals[0] += full
+        totals[1] += incremental
+        totals[2] += first
+        if verbosity > 0:
+            print(
+                "{0}: {1} sections, {2} KiB; full {3:.4f}s, incremental {4:.4f}s, first record {5:.4f}s".format(
+                    path,
+                    len(expected),
+                    len(page) // 1024,
+                    full,
+                    incremental,
+                    first,
+                )
+            )
+    print(
+        "Total: full {0:.4f}s, incremental {1:.4f}s, first record {2:.4f}s".format(
+            *totals
+        )
+    )
+
+
+#########################################################################
@@ -16,6 +16,9 @@ from django.utils.encoding import force_text
 from ..models import AuroraDepartment
 from ..utils import aurora_scrape
 from ..utils.load_classes import load_classes
+from ..utils.pool import imap_ordered
+from ..utils.resolver import SyncResolver
+from ..utils.transport import build_transport, set_transport
 
 #########################################################################
 #########################################################################
@@ -35,6 +38,31 @@ OPTION_LIST = (
         ["--delete"],
         dict(action="store_true", help="Delete sections when no longer available"),
     ),
+    (
+        ["--dry-run"],
+        dict(
+            action="store_true",
+            help="Report the changes that would be made, without saving them",
+        ),
+    ),
+    (
+        ["--record"],
+        dict(metavar="DIR", help="Save the banner pages fetched in this directory"),
+    ),
+    (
+        ["--replay"],
+        dict(
+            metavar="DIR",
+            help="Use the banner pages saved (with --record) in this directory; no network is used",
+        ),
+    ),
+    (
+        ["--workers"],
+        dict(
+            type=int,
+            help='Number of pages to fetch concurrently (default: the "sync:workers" setting)',
+        ),
+    ),
 )
 ARGS_USAGE = "[--year YYYY --term TTTT]"
 HELP_TEXT = "Populate course information from aurora/banner"
@@ -66,8 +94,14 @@ def main(options, args):
 
     verbosity = int(options["verbosity"])
 
+    if options["record"] or options["replay"]:
+        set_transport(
+            build_transport(replay_dir=options["replay"], record_dir=options["record"])
+        )
+
     output = StringIO()
     aurora_sync_codes = AuroraDepartment.objects.sync_codes()
+    job_list = []
     for semester in semester_qs:
         if semester.is_current():
             p = Semester.objects.current_percent()
@@ -82,38 +116,46 @@ def main(options, args):
         year = semester.year
         term = semester.get_term_display().lower()
         for course_code in aurora_sync_codes:
-            try:
-                data = aurora_scrape.main(course_code, year, term)
-            except AssertionError:
-                if verbosity > 0:
-                    print(
-                        "No classes found for {0} {1} {2}".format(
-                            course_code, year, term
-                        )
-                    )
-            else:
-                if verbosity > 2:
-                    pprint(data)
-                warnings = load_classes(
-                    year,
-                    term,
-                    course_code,
-                    data,
-                    delete=options["delete"],
-                    verbosity=verbosity,
+            job_list.append((semester, course_code, year, term))
+
+    # the aurora mappings are loaded once, for all the departments.
+    resolver = SyncResolver(verbosity)
+
+    # Fetch (and parse) pages concurrently; but results are loaded
+    #   here, one at a time and in order.
+    fetch_list = [(course_code, year, term) for _, course_code, year, term in job_list]
+    fetch_iter = imap_ordered(aurora_scrape.main, fetch_list, options.get("workers"))
+    for (semester, course_code, year, term), (_, future) in zip(job_list, fetch_iter):
+        try:
+            data = future.result()
+        except AssertionError:
+            if verbosity > 0:
+                print(
+                    "No classes found for {0} {1} {2}".format(course_code, year, term)
                 )
-                if any(warnings.values()) and verbosity > 0:
-                    print(
-                        "*** Semester: {}, Department: {} ***".format(
-                            semester, course_code
-                        )
-                    )
-                # pprint(warnings)
-                for section in warnings:
-                    if warnings[section]:
-                        print(force_text(section), file=output)
-                        for warning in warnings[section]:
-                            print("\t" + force_text(warning), file=output)
+        else:
+            if verbosity > 2:
+                pprint(data)
+            warnings = load_classes(
+                year,
+                term,
+                course_code,
+                data,
+                delete=options["delete"],
+                verbosity=verbosity,
+                dry_run=options["dry_run"],
+                resolver=resolver,
+            )
+            if any(warnings.values()) and verbosity > 0:
+                print(
+                    "*** Semester: {}, Department: {} ***".format(semester, course_code)
+                )
+            # pprint(warnings)
+            for section in warnings:
+                if warnings[section]:
+                    print(force_text(section), file=output)
+                    for warning in warnings[section]:
+                        print("\t" + force_text(warning), file=output)
 
     if not aurora_sync_codes:
         print(
@@ -0,0 +1,46 @@
+"""
+Django manage interface for serving recorded aurora/banner pages over HTTP.
+"""
+#########################################################################
+#######################
+from __future__ import print_function, unicode_literals
+
+from ..utils.transport import serve_recordings
+
+#######################
+
+#########################################################################
+
+DJANGO_COMMAND = "main"  # enable this is a CLI command
+USE_ARGPARSE = True
+OPTION_LIST = (
+    (["--address"], {"default": "127.0.0.1", "help": "Address to listen on"}),
+    (["--port"], {"type": int, "default": 8000, "help": "Port to listen on"}),
+    (["directory"], {"help": 'Recordings directory (see "banner:record_dir")'}),
+)
+HELP_TEXT = "Serve recorded aurora/banner pages (a local stand-in for banner)"
+
+#########################################################################
+
+
+def main(options, args):
+    verbosity = int(options["verbosity"])
+    server = serve_recordings(
+        options["directory"], address=options["address"], port=options["port"]
+    )
+    if verbosity > 0:
+        print(
+            "Serving {0} on http://{1}:{2}/".format(
+                options["directory"], options["address"], options["port"]
+            )
+        )
+        print('Set "banner:root_uri" to this address to use it.')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+#########################################################################
@@ -6,7 +6,7 @@ Django manage interface for populating course information from aurora/banner.
 from __future__ import print_function, unicode_literals
 
 from ..models import AuroraDepartment
-from ..utils import aurora_scrape
+from ..utils.catalog import CatalogCache, course_url, description_changed
 
 #######################
 
@@ -19,6 +19,13 @@ OPTION_LIST = (
         ["--no-save"],
         {"action": "store_true", "help": "Print changes, do not commit to database"},
     ),
+    (
+        ["--workers"],
+        {
+            "type": int,
+            "help": 'Number of pages to fetch concurrently (default: the "sync:workers" setting)',
+        },
+    ),
     (["dept"], {"nargs": "*", "help": "Department code(s) to synchronize"}),
 )
 HELP_TEXT = "Update course descriptions from aurora/banner"
@@ -35,25 +42,32 @@ def main(options, args):
     else:
         dept_list = AuroraDepartment.objects.synchronize()
 
-    for dept in dept_list:
-        for course in dept.department.course_set.active():
-            if verbosity > 0:
-                print(course, end=" ")
-            desc = aurora_scrape.fetch_catalog_entry_by_course(
-                dept.department_code, course.code
-            )
-            if verbosity > 2:
-                print(desc)
-            if course.description != desc:
-                if verbosity > 1:
-                    print("[updated]", end=" ")
-                course.description = desc
-                if not options["no_save"]:
-                    course.save()
-            else:
-                if verbosity > 1:
-                    print("[no change]", end=" ")
-            print()
+    course_list = [
+        (dept.department_code, course)
+        for dept in dept_list.select_related("department")
+        for course in dept.department.course_set.active()
+    ]
+    catalog = CatalogCache(workers=options["workers"])
+    catalog.prefetch(
+        [course_url(dept_code, course.code) for dept_code, course in course_list]
+    )
+
+    for dept_code, course in course_list:
+        if verbosity > 0:
+            print(course, end=" ")
+        desc = catalog.get(course_url(dept_code, course.code))
+        if verbosity > 2:
+            print(desc)
+        if description_changed(course.description, desc):
+            if verbosity > 1:
+                print("[updated]", end=" ")
+            course.description = desc
+            if not options["no_save"]:
+                course.save(update_fields=["description", "modified"])
+        else:
+            if verbosity > 1:
+                print("[no change]", end=" ")
+        print()
 
 
 #########################################################################
@@ -1,6 +1,7 @@
 """
 Update enrollment information for classes.
-Note that this always creates new enrollment records.
+Note that this always creates new enrollment records,
+unless --skip-unchanged is given.
 """
 #######################
 from __future__ import print_function, unicode_literals
@@ -8,13 +9,36 @@ from __future__ import print_function, unicode_literals
 import time
 
 from classes.models import Enrollment, Section, Semester
+from classes.utils import termcache
 
-from ..utils.enrollment import get_enrollment
+from ..utils.enrollment import collect_enrollment
 
 #######################
 
 DJANGO_COMMAND = "main"
-OPTION_LIST = ()
+OPTION_LIST = (
+    (
+        ["--workers"],
+        dict(
+            type=int,
+            help='Number of sections to fetch concurrently (default: the "enrollment:workers" setting)',
+        ),
+    ),
+    (
+        ["--rate"],
+        dict(
+            type=float,
+            help='Maximum requests per second (default: the "enrollment:rate" setting)',
+        ),
+    ),
+    (
+        ["--skip-unchanged"],
+        dict(
+            action="store_true",
+            help="Only create enrollment records when the numbers have changed",
+        ),
+    ),
+)
 USE_ARGPARSE = True
 HELP_TEXT = __doc__.strip()
 
@@ -22,35 +46,81 @@ HELP_TEXT = __doc__.strip()
 def main(options, args):
     verbosity = int(options.get("verbosity"))
     term_list = Semester.objects.advertised()
+    section_list = []
     for term in term_list:
-        for section in term.section_set.advertised():
-            result = get_enrollment(section)
-            if not result:
-                if verbosity >= 1:
-                    print(
-                        "No enrollment info for {section} [{section.term}]".format(
-                            section=section
-                        )
-                    )
-                continue
+        section_list.extend(term.section_set.advertised())
 
-            capacity, actual, remaining, waitlist_cap, waitlist_actual, waitlist_remain = (
-                result
-            )
-            if verbosity > 2:
+    latest_map = {}
+    if options.get("skip_unchanged"):
+        latest_map = (
+            Enrollment.objects.filter(section__term__in=term_list)
+            .latest_per_section()
+            .snapshot_map()
+        )
+
+    start = time.time()
+    failures = 0
+    unchanged = 0
+    enrollment_list = []
+    for section, result, error in collect_enrollment(
+        section_list, workers=options.get("workers"), rate=options.get("rate")
+    ):
+        if error is not None:
+            failures += 1
+            if verbosity >= 1:
+                print(
+                    "Could not fetch enrollment for {section} [{section.term}]: {error}".format(
+                        section=section, error=error
+                    )
+                )
+            continue
+        if not result:
+            if verbosity >= 1:
                 print(
-                    "{0}: enrollment (cap/act/rem): {1}/{2}/{3}; waitlist: (cap/act/remain): {4}/{5}/{6}".format(
-                        section, *result
+                    "No enrollment info for {section} [{section.term}]".format(
+                        section=section
                     )
                 )
-            Enrollment.objects.create(
-                section=section,
-                capacity=capacity,
-                registration=actual,
-                waitlist_capacity=waitlist_cap,
-                waitlist_registration=waitlist_actual,
+            continue
+
+        capacity, actual, remaining, waitlist_cap, waitlist_actual, waitlist_remain = (
+            result
+        )
+        if verbosity > 2:
+            print(
+                "{0}: enrollment (cap/act/rem): {1}/{2}/{3}; waitlist: (cap/act/remain): {4}/{5}/{6}".format(
+                    section, *result
+                )
+            )
+        enrollment = Enrollment(
+            section=section,
+            capacity=capacity,
+            registration=actual,
+            waitlist_capacity=waitlist_cap,
+            waitlist_registration=waitlist_actual,
+        )
+        if latest_map.get(section.pk) == enrollment.snapshot():
+            unchanged += 1
+            continue
+        enrollment_list.append(enrollment)
+    Enrollment.objects.bulk_create(enrollment_list, batch_size=500)
+    # bulk_create() does not send post_save.
+    Section.objects.filter(term__in=term_list).refresh_latest_enrollment()
+    termcache.invalidate(*[term.pk for term in term_list])
+    elapsed = time.time() - start
+
+    if verbosity > 1 or failures:
+        rate = len(section_list) / elapsed if elapsed else 0
+        print(
+            "Enrollment: {0} sections in {1:.1f}s ({2:.1f} sections/sec); {3} created; {4} unchanged; {5} failed".format(
+                len(section_list),
+                elapsed,
+                rate,
+                len(enrollment_list),
+                unchanged,
+                failures,
             )
-            time.sleep(0.1)
+        )
 
 
 #
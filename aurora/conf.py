@@ -37,6 +37,33 @@ DEFAULT = {
     "banner:department_list_url": "/banprod/bwckctlg.p_disp_cat_term_date",
     # Should records with no campus information be accepted, or rejected?
     "banner:accept_no_campus": True,
+    # The maximum number of simultaneous connections to any one banner host.
+    "banner:max_connections_per_host": 4,
+    # The timeout (in seconds) for banner requests.  (None for no timeout.)
+    "banner:timeout": 60,
+    # A directory in which to cache banner responses; None disables the cache.
+    # Useful while debugging, or to run update_course_desc after load_classes
+    # without fetching the same pages again.
+    "banner:cache_dir": None,
+    # How long (in seconds) cached banner responses are used.  (None for ever.)
+    "banner:cache_ttl": 6 * 60 * 60,
+    # Save every banner response in this directory (for later replay).
+    "banner:record_dir": None,
+    # Serve banner responses from this directory of recordings, instead of
+    # fetching them.  (No network is used.)
+    "banner:replay_dir": None,
+    # When synchronizing, how many banner pages may be fetched concurrently?
+    # (Use 1 to fetch pages one at a time.)
+    "sync:workers": 4,
+    # When updating enrollment, how many sections may be fetched concurrently?
+    "enrollment:workers": 4,
+    # The maximum number of enrollment requests per second (over all workers).
+    # (Use None for no limit.)
+    "enrollment:rate": 10,
+    # How many times a failed enrollment request is retried, and the initial
+    # delay (in seconds) before retrying.  The delay doubles on each retry.
+    "enrollment:retries": 3,
+    "enrollment:retry_backoff": 1.0,
 }
 
 
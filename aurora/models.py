@@ -95,10 +95,8 @@ class AuroraDepartmentManager(models.Manager):
             pass
 
         if obj is None:
-            results_list = Department.objects.active().filter(code=department_code)
-            try:
-                obj = results_list.get()
-            except Department.DoesNotExist:
+            obj = self.resolve(department_code)
+            if obj is None:
                 return None
 
         if obj is None and create:
@@ -110,6 +108,17 @@ class AuroraDepartmentManager(models.Manager):
 
         return obj, created
 
+    def resolve(self, department_code):
+        """
+        Find the department for ``department_code`` without using (or
+        writing) the mapping table.  Returns None if there is no match.
+        """
+        results_list = Department.objects.active().filter(code=department_code)
+        try:
+            return results_list.get()
+        except Department.DoesNotExist:
+            return None
+
     def synchronize(self):
         """
         Return a queryset of objects to synchronize.
@@ -172,29 +181,47 @@ class AuroraInstructorManager(models.Manager):
                 )
             )
 
-        if person is None:
-            # check for a matching person
-            # will cause problems with some names
-            if verbosity > 2:
-                print("Looking for existing person")
-            try:
-                first, middle, last = instructor.split(None, 2)
-            except ValueError:
-                first, last = instructor.split(None, 1)
-            if verbosity > 2:
-                print('Using last="{}", first="{}"'.format(last, first))
-            results_list = Person.objects.search(last, first)
+        person, created = self.resolve(
+            instructor, email_addr, create=create, verbosity=verbosity
+        )
+        if person is not None:
             if verbosity > 2:
-                print("Result list has {} candidates".format(results_list.count()))
+                print("initializing mappin record")
+            self.get_or_create(instructor=instructor, person=person)
+            person.add_flag_by_name("instructor", "Available to instruct courses")
+        if verbosity > 2:
+            print("Late return; person = {}; created = {}".format(person, created))
+        return person, created
 
-            try:
-                person = results_list.get()
-                if verbosity > 2:
-                    print("[2] person =", person)
-            except Person.DoesNotExist:
-                pass
-            except Person.MultipleObjectsReturned:
-                pass
+    def resolve(self, instructor, email_addr, create=False, verbosity=0):
+        """
+        Find (or create) the person for ``instructor`` without using (or
+        writing) the mapping table.  Returns ``(person, created)``.
+        """
+        person = None
+        created = False
+        # check for a matching person
+        # will cause problems with some names
+        if verbosity > 2:
+            print("Looking for existing person")
+        try:
+            first, middle, last = instructor.split(None, 2)
+        except ValueError:
+            first, last = instructor.split(None, 1)
+        if verbosity > 2:
+            print('Using last="{}", first="{}"'.format(last, first))
+        results_list = Person.objects.search(last, first)
+        if verbosity > 2:
+            print("Result list has {} candidates".format(results_list.count()))
+
+        try:
+            person = results_list.get()
+            if verbosity > 2:
+                print("[2] person =", person)
+        except Person.DoesNotExist:
+            pass
+        except Person.MultipleObjectsReturned:
+            pass
 
         if person is None and email_addr is not None:
             if verbosity > 2:
@@ -217,13 +244,6 @@ class AuroraInstructorManager(models.Manager):
             if verbosity > 2:
                 print("[4] person =", person)
             created = True
-        if person is not None:
-            if verbosity > 2:
-                print("initializing mappin record")
-            self.get_or_create(instructor=instructor, person=person)
-            person.add_flag_by_name("instructor", "Available to instruct courses")
-        if verbosity > 2:
-            print("Late return; person = {}; created = {}".format(person, created))
         return person, created
 
     def create_person(self, name, email_addr):
@@ -275,15 +295,29 @@ class AuroraLocationManager(models.Manager):
         except AuroraLocation.DoesNotExist:
             pass
 
+        if not classroom:
+            classroom, created = self.resolve(location, create=create)
+
+        if classroom is not None:
+            self.get_or_create(location=location, classroom=classroom)
+
+        return classroom, created
+
+    def resolve(self, location, create=False):
+        """
+        Find (or create) the classroom for ``location`` without using (or
+        writing) the mapping table.  Returns ``(classroom, created)``.
+        """
+        classroom = None
+        created = False
         number, building = self.split_number_building(location)
         slug1 = slugify(number + " " + building)
         slug2 = slugify(location)
-        if not classroom:
-            # check for a matching classroom.
-            try:
-                classroom = ClassRoom.objects.get(slug=slug1)
-            except ClassRoom.DoesNotExist:
-                pass
+        # check for a matching classroom.
+        try:
+            classroom = ClassRoom.objects.get(slug=slug1)
+        except ClassRoom.DoesNotExist:
+            pass
 
         if not classroom:
             try:
@@ -303,9 +337,6 @@ class AuroraLocationManager(models.Manager):
             classroom = self.create(location)
             created = True
 
-        if classroom is not None:
-            self.get_or_create(location=location, classroom=classroom)
-
         return classroom, created
 
     def split_number_building(self, location):
@@ -381,18 +412,7 @@ class AuroraTimeslotManager(models.Manager):
             pass
 
         if timeslot is None:
-            # check to see if we can find a matching semester...
-            start_time, stop_time = self.read_times(schedule_time)
-            try:
-                timeslot = Timeslot.objects.get(
-                    day=schedule_days, start_time=start_time, stop_time=stop_time
-                )
-            except Timeslot.DoesNotExist:
-                pass
-
-        if timeslot is None and create:
-            timeslot = self.create(schedule_days, schedule_time)
-            created = True
+            timeslot, created = self.resolve(schedule_days, schedule_time, create)
 
         if timeslot is not None:
             self.get_or_create(
@@ -402,6 +422,27 @@ class AuroraTimeslotManager(models.Manager):
             )
         return timeslot, created
 
+    def resolve(self, schedule_days, schedule_time, create=False):
+        """
+        Find (or create) the timeslot without using (or writing) the
+        mapping table.  Returns ``(timeslot, created)``.
+        """
+        timeslot = None
+        created = False
+        # check to see if we can find a matching timeslot...
+        start_time, stop_time = self.read_times(schedule_time)
+        try:
+            timeslot = Timeslot.objects.get(
+                day=schedule_days, start_time=start_time, stop_time=stop_time
+            )
+        except Timeslot.DoesNotExist:
+            pass
+
+        if timeslot is None and create:
+            timeslot = self.create(schedule_days, schedule_time)
+            created = True
+        return timeslot, created
+
     def create(self, schedule_days, schedule_time):
 
         dtstart, dtend = self.read_times(schedule_time)
@@ -467,19 +508,7 @@ class AuroraDateRangeManager(models.Manager):
             pass
 
         if date_range is None:
-            # check to see if we can find a matching semester...
-            data = self.breakout_data(schedule_date_range)
-            try:
-                date_range = SemesterDateRange.objects.get(**data)
-            except SemesterDateRange.DoesNotExist:
-                pass
-            if date_range is None and create:
-                # to create, we need a semester object as well...
-                semester = self.guess_semester(data)
-                if semester is not None:
-                    data["semester"] = semester
-                    date_range = SemesterDateRange.objects.create(**data)
-                    created = True
+            date_range, created = self.resolve(schedule_date_range, create)
 
         if date_range is not None:
             self.get_or_create(
@@ -487,6 +516,28 @@ class AuroraDateRangeManager(models.Manager):
             )
         return date_range, created
 
+    def resolve(self, schedule_date_range, create=False):
+        """
+        Find (or create) the semester date range without using (or
+        writing) the mapping table.  Returns ``(date_range, created)``.
+        """
+        date_range = None
+        created = False
+        # check to see if we can find a matching semester...
+        data = self.breakout_data(schedule_date_range)
+        try:
+            date_range = SemesterDateRange.objects.get(**data)
+        except SemesterDateRange.DoesNotExist:
+            pass
+        if date_range is None and create:
+            # to create, we need a semester object as well...
+            semester = self.guess_semester(data)
+            if semester is not None:
+                data["semester"] = semester
+                date_range = SemesterDateRange.objects.create(**data)
+                created = True
+        return date_range, created
+
     def create(self, schedule_date_range):
         data = self.breakout_data(schedule_date_range)
         date_range = SemesterDateRange.objects.find(**data)
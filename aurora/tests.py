@@ -7,7 +7,22 @@ Replace these with more appropriate tests for your application.
 #######################
 from __future__ import print_function, unicode_literals
 
-from django.test import TestCase
+import os
+
+from django.test import SimpleTestCase, TestCase
+from lxml import etree as ETree
+
+from .utils import aurora_scrape
+
+#######################
+
+TESTDATA_DIR = os.path.join(os.path.dirname(__file__), "testdata")
+
+
+def _read_page(name):
+    with open(os.path.join(TESTDATA_DIR, name), "rb") as f:
+        return f.read()
+
 
 #######################
 
@@ -20,6 +35,25 @@ class SimpleTest(TestCase):
         self.failUnlessEqual(1 + 1, 2)
 
 
+class ScrapePageTest(SimpleTestCase):
+    def test_error_page(self):
+        """
+        A page without the course list structure (e.g., a banner
+        maintenance page) is an error, not an empty course list;
+        otherwise load_classes --delete would remove every section.
+        """
+        page = _read_page("banner_maintenance.html")
+        with self.assertRaises(AssertionError):
+            aurora_scrape.scrape_page(ETree.HTML(page))
+        with self.assertRaises(AssertionError):
+            list(aurora_scrape.iter_scrape_page(page))
+
+    def test_no_sections(self):
+        page = _read_page("banner_no_sections.html")
+        self.assertEqual(aurora_scrape.scrape_page(ETree.HTML(page)), [])
+        self.assertEqual(list(aurora_scrape.iter_scrape_page(page)), [])
+
+
 __test__ = {
     "doctest": """
 Another way to test that 1 + 1 is equal to 2.
@@ -20,12 +20,15 @@ PYTHONPATH="$HOME/src/site-stats:$PYTHONPATH" DJANGO_SETTINGS_MODULE='stats.sett
 #######################
 from __future__ import print_function, unicode_literals
 
+import io
 import sys
 from datetime import date
 from pprint import pprint  # only used in the driver.
 
 import lxml.html
 from aurora import conf
+from aurora.utils.pool import host_semaphore
+from aurora.utils.transport import get_transport
 from django.utils import six
 from lxml import etree as ETree
 
@@ -34,13 +37,13 @@ from lxml import etree as ETree
 try:
     # Python 3:
     from urllib.parse import urlparse, urlencode
-    from urllib.request import urlopen, Request
+    from urllib.request import Request
     from urllib.error import HTTPError, URLError
 except ImportError:
     # Python 2:
     from urlparse import urlparse
     from urllib import urlencode
-    from urllib2 import urlopen, Request, HTTPError, URLError
+    from urllib2 import Request, HTTPError, URLError
 
 try:
     import lxml
@@ -118,12 +121,24 @@ TERMS = (("10", "winter"), ("50", "summer"), ("90", "fall"))
 #     return html
 
 
+def fetch_url(url, data=None):
+    """
+    Fetch the given url (POSTing ``data``, if given) and return the body.
+
+    The number of simultaneous connections to any one host is capped by
+    the ``banner:max_connections_per_host`` setting, so this is safe to
+    call from several threads.
+    Connections are reused; see ``aurora.utils.transport``.
+    """
+    with host_semaphore(url):
+        return get_transport().fetch(url, data)
+
+
 def get_etree(url):
     """
     Get the element tree structure for the given page.
     """
-    page = urlopen(url)
-    html = lxml.html.fromstring(page.read())
+    html = lxml.html.fromstring(fetch_url(url))
     return html
 
 
@@ -172,9 +187,9 @@ def get_term_code(term_name):
     assert False, "term name %r not recognized" % term_name
 
 
-def get_page_fp(subject, year, term_name):
+def get_page_postdata(subject, year, term_name):
     """
-    Given the initial inputs, get the file object for that page.
+    Given the initial inputs, encode the POST data for the course list.
     """
     postdata = []
     for name, value in URL_DATA:
@@ -189,9 +204,23 @@ def get_page_fp(subject, year, term_name):
         url_data = urlencode(postdata)
     else:
         raise RuntimeError("unexpected six python verison")
+    return url_data
 
-    url_fp = urlopen(COURSE_LIST_URI, url_data)
-    return url_fp
+
+def get_page_fp(subject, year, term_name):
+    """
+    Given the initial inputs, get the file object for that page.
+    """
+    url_data = get_page_postdata(subject, year, term_name)
+    return io.BytesIO(fetch_url(COURSE_LIST_URI, url_data))
+
+
+def get_page(subject, year, term_name):
+    """
+    Given the initial inputs, get the contents of that page.
+    """
+    url_data = get_page_postdata(subject, year, term_name)
+    return fetch_url(COURSE_LIST_URI, url_data)
 
 
 def scrape_row_header(element):
@@ -233,40 +262,47 @@ def scrape_row_info(element):
     """
     result = {}
     notes = []
+    nested = []
+    unlabelled = []
+    catalog_entry_href = None
 
     if element.text is not None and element.text.strip():  # initial note
         notes.append(element.text.strip())
 
-    spans = element.findall("span")
-    for e in spans:  # labelled info.
-        result[e.text.strip().rstrip(":").lower().replace(" ", "_")] = (
-            e.tail.strip().rstrip(" (") if e.tail is not None else None
-        )
-    children = element.getchildren()
-
-    for child in children:
+    # A single walk over the children; the results are combined below
+    #   in the same order of precedence as separate passes would.
+    in_notes = True
+    for child in element:
+        if child.tag == "span":  # labelled info.
+            in_notes = False
+            result[child.text.strip().rstrip(":").lower().replace(" ", "_")] = (
+                child.tail.strip().rstrip(" (") if child.tail is not None else None
+            )
+        elif in_notes and child.tail is not None and child.tail.strip():
+            notes.append(child.tail.strip())  # extra notes
         if child.tag == "p" and len(child) > 0:
-            result.update(scrape_row_info(child))
-
-    for child in children:  # extra notes
-        if child.tag == "span":
-            break
-        if child.tail is not None and child.tail.strip():
-            notes.append(child.tail.strip())
-
-    for child in children:  # unlabelled info -- annoying.
-        if child.tag == "br" and child.tail is not None:
-            tail = child.tail.strip()
-            if "Campus" in tail:
-                result["campus"] = tail
-            if "Schedule" in tail:
-                result["schedule_type"] = tail
-            if "Credits" in tail:
-                result["credit_hours"] = tail
-
-    for child in element.findall("a"):
-        if (child.text is not None) and ("View Catalog Entry" == child.text.strip()):
-            result["catalog_entry_href"] = child.attrib["href"]
+            nested.append(child)
+        elif child.tag == "br" and child.tail is not None:
+            unlabelled.append(child.tail.strip())
+        elif child.tag == "a":
+            if (child.text is not None) and (
+                "View Catalog Entry" == child.text.strip()
+            ):
+                catalog_entry_href = child.attrib["href"]
+
+    for child in nested:
+        result.update(scrape_row_info(child))
+
+    for tail in unlabelled:  # unlabelled info -- annoying.
+        if "Campus" in tail:
+            result["campus"] = tail
+        if "Schedule" in tail:
+            result["schedule_type"] = tail
+        if "Credits" in tail:
+            result["credit_hours"] = tail
+
+    if catalog_entry_href is not None:
+        result["catalog_entry_href"] = catalog_entry_href
 
     result["note"] = notes
 
@@ -274,12 +310,15 @@ def scrape_row_info(element):
     schedule = element.find("table")
     if schedule is not None:
         result["schedule"] = []
-        headers = schedule[1]
+        headers = [
+            h.text.strip().lower().replace(" ", "_") if h.text is not None else None
+            for h in schedule[1]
+        ]
         for row in schedule[2:]:  # 0: title, 1: headers
             sched = {}
             for i in range(len(headers)):
                 if row[i].text is not None and row[i].text.strip():
-                    key = headers[i].text.strip().lower().replace(" ", "_")
+                    key = headers[i]
                     value = row[i].text.strip()  # .rstrip(' (')
                     sched[key] = value
                     if key == "instructors":
@@ -345,15 +384,94 @@ def scrape_page(html):
     return results
 
 
+def _is_pagebodydiv(element):
+    """
+    Is ``element`` the pagebodydiv of the page (html > body > div)?
+    """
+    if element.tag != "div":
+        return False
+    if "pagebodydiv" not in element.attrib.get("class", "").split():
+        return False
+    body = element.getparent()
+    return (
+        body is not None
+        and body.tag == "body"
+        and body.getparent() is not None
+        and body.getparent().tag == "html"
+    )
+
+
+def _in_sections_table(element):
+    """
+    Is ``element`` a child of the top level datadisplaytable (and not
+    of a nested schedule table)?
+    """
+    table = element.getparent()
+    if table is None or table.tag != "table":
+        return False
+    if "datadisplaytable" not in table.attrib.get("class", "").split():
+        return False
+    div = table.getparent()
+    return (
+        div is not None
+        and div.tag == "div"
+        and "pagebodydiv" in div.attrib.get("class", "").split()
+    )
+
+
+def iter_scrape_page(source, chunk_size=64 * 1024):
+    """
+    Like ``scrape_page(ETree.HTML(source))``, but the page is parsed
+    incrementally and the records are yielded as soon as each pair of
+    rows is complete.  Rows are discarded once scraped, so memory use
+    does not grow with the size of the page.
+
+    ``source`` is the page as bytes, or a file-like object.
+    As with ``scrape_page()``, an AssertionError is raised for a page
+    without the usual structure (e.g., a banner error page).
+    """
+    if isinstance(source, six.binary_type):
+        source = io.BytesIO(source)
+    parser = ETree.HTMLPullParser(events=("end",), tag=("caption", "tr", "div"))
+    header = None
+    pagebodydiv_seen = False
+    while True:
+        chunk = source.read(chunk_size)
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()
+        for event, element in parser.read_events():
+            if element.tag == "div":
+                pagebodydiv_seen = pagebodydiv_seen or _is_pagebodydiv(element)
+                continue
+            if not _in_sections_table(element):
+                continue
+            if element.tag == "caption":
+                assert element.text == "Sections Found", "no sections found, bailing..."
+                continue
+            if header is None:
+                header = element
+                continue
+            yield scrape_tr_pair(header, element)
+            # the rows are done with; drop them from the tree.
+            table = element.getparent()
+            table.remove(header)
+            table.remove(element)
+            header = None
+        if not chunk:
+            break
+    assert pagebodydiv_seen, "Could not find child tag div with class pagebodydiv"
+    assert header is None, "expected TRs in pairs... what?"
+
+
 def main(subject, year, term_name):
     """
     Given ``subject``, ``year``, ``term_name``, do the heavy lifting.
     Return a list of python dictionary.
     """
-    page = get_page_fp(subject, year, term_name)
-    html = ETree.HTML(page.read())
-    info = scrape_page(html)
-    return info
+    page = get_page(subject, year, term_name)
+    return list(iter_scrape_page(page))
 
 
 def to_xml(info):
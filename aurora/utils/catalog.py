@@ -0,0 +1,105 @@
+# -*- encoding: utf-8
+#
+# Course descriptions from the banner catalog.
+#
+# A CatalogCache lives for one run: the catalog entries a run needs are
+# collected up front and fetched concurrently with ``prefetch()``; then
+# ``get()`` is a dictionary lookup.  Descriptions are compared by a
+# digest of their (whitespace normalized) text, so a course is only
+# saved when its description really changed.
+#
+#######################
+from __future__ import print_function, unicode_literals
+
+import hashlib
+
+from . import aurora_scrape
+from .pool import imap_ordered
+
+#######################
+
+try:
+    # Python 3:
+    from http.client import HTTPException
+except ImportError:
+    # Python 2:
+    from httplib import HTTPException
+
+#######################
+
+
+def entry_url(href):
+    """
+    The url of the catalog entry at ``href`` (as found in a course list).
+    """
+    return aurora_scrape.BANNER_ROOT + href
+
+
+def course_url(department, course):
+    """
+    The url of the catalog entry for the given department and course codes.
+    """
+    return aurora_scrape.build_catalog_entry_url(department, course)
+
+
+def fetch_description(url):
+    return aurora_scrape.scrape_catalog_desc(aurora_scrape.get_etree(url))
+
+
+def description_digest(text):
+    """
+    A digest of the description ``text``, ignoring differences in
+    whitespace.
+    """
+    text = " ".join((text or "").split())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def description_changed(current, new):
+    """
+    Does the ``new`` description differ (other than in whitespace) from
+    the ``current`` one?
+    """
+    return description_digest(current) != description_digest(new)
+
+
+#######################
+
+
+class CatalogCache(object):
+    """
+    Catalog descriptions, by url, for the duration of one run.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self._descriptions = {}
+
+    def prefetch(self, url_list):
+        """
+        Fetch the descriptions of all the urls in ``url_list`` concurrently.
+        Failures are not cached; ``get()`` tries again (and raises).
+        """
+        pending = []
+        for url in url_list:
+            if url not in self._descriptions and url not in pending:
+                pending.append(url)
+        fetch_iter = imap_ordered(
+            fetch_description, [(url,) for url in pending], self.workers
+        )
+        for (url,), future in fetch_iter:
+            try:
+                self._descriptions[url] = future.result()
+            except (IOError, HTTPException, AssertionError):
+                pass
+
+    def get(self, url):
+        """
+        Return the description from the catalog entry at ``url``.
+        """
+        if url not in self._descriptions:
+            self._descriptions[url] = fetch_description(url)
+        return self._descriptions[url]
+
+
+#######################
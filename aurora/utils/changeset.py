@@ -0,0 +1,161 @@
+# -*- encoding: utf-8
+#
+# The set of changes computed by a sync, before anything is written.
+#
+# Only what differs is written: changed fields (grouped into one
+# ``bulk_update()`` per model and field set), added and removed many to
+# many rows, and one ``update()`` for all schedules that are no longer
+# in aurora.  The same changeset can be reported instead of applied.
+#
+#######################
+from __future__ import print_function, unicode_literals
+
+from django.db.models import Q
+from django.utils.encoding import force_text
+
+#######################
+
+
+class Changeset(object):
+    """
+    Changes to existing objects, recorded as the sync runs.
+    New objects are listed (for ``report()``); saving them is up to the
+    caller, since the order matters.
+    """
+
+    def __init__(self):
+        self.created = []
+        self.updated = {}  # (model, pk) -> (obj, set of field names)
+        self.m2m = {}  # (model, id(obj), field name) -> (obj, field name, old, new)
+        self.deactivated = {}  # (model, pk) -> obj
+
+    def __bool__(self):
+        return bool(self.created or self.updated or self.m2m or self.deactivated)
+
+    __nonzero__ = __bool__
+
+    def create(self, obj):
+        self.created.append(obj)
+
+    def new(self, model):
+        """
+        The new objects of the given model.
+        """
+        return [obj for obj in self.created if isinstance(obj, model)]
+
+    def update(self, obj, *fields):
+        """
+        Record that ``fields`` of the (existing) ``obj`` have changed.
+        """
+        if obj.pk is None:
+            return  # new objects are saved whole.
+        key = (type(obj), obj.pk)
+        self.updated.setdefault(key, (obj, set()))[1].update(fields)
+
+    def set_m2m(self, obj, name, current, value):
+        """
+        Record that the many to many field ``name`` of ``obj`` changes
+        from the ``current`` to the ``value`` list of objects.
+        """
+        key = (type(obj), id(obj), name)
+        if key in self.m2m:
+            current = self.m2m[key][2]
+        self.m2m[key] = (obj, name, set(current), set(value))
+
+    def deactivate(self, obj):
+        """
+        Record that ``obj`` is no longer active.
+        """
+        obj.active = False
+        self.deactivated[type(obj), obj.pk] = obj
+
+    def report(self):
+        """
+        Return a list of lines describing the changes.
+        """
+        lines = []
+        for obj in self.created:
+            lines.append(
+                "Create {0}: {1}".format(obj._meta.verbose_name, force_text(obj))
+            )
+        for obj, fields in self.updated.values():
+            lines.append(
+                "Update {0} {1}: {2}".format(
+                    obj._meta.verbose_name, force_text(obj), ", ".join(sorted(fields))
+                )
+            )
+        for obj, name, current, value in self.m2m.values():
+            if current == value:
+                continue
+            diff = ["+" + force_text(o) for o in value - current]
+            diff += ["-" + force_text(o) for o in current - value]
+            lines.append(
+                "Update {0} {1}: {2} {3}".format(
+                    obj._meta.verbose_name,
+                    force_text(obj),
+                    name,
+                    " ".join(sorted(diff)),
+                )
+            )
+        for obj in self.deactivated.values():
+            lines.append(
+                "Deactivate {0}: {1}".format(obj._meta.verbose_name, force_text(obj))
+            )
+        return lines
+
+    def apply(self, now):
+        """
+        Write the changes to existing objects (and the many to many rows
+        of all objects, which must be saved by now).
+        ``now`` is the modification time; ``bulk_update()`` and
+        ``update()`` do not apply ``auto_now``.
+        """
+        groups = {}
+        for (model, pk), (obj, fields) in self.updated.items():
+            if (model, pk) in self.deactivated:
+                fields.discard("active")
+            if fields:
+                groups.setdefault((model, frozenset(fields)), []).append(obj)
+        for (model, fields), obj_list in groups.items():
+            for obj in obj_list:
+                obj.modified = now
+            model.objects.bulk_update(obj_list, sorted(fields) + ["modified"])
+
+        by_field = {}
+        for obj, name, current, value in self.m2m.values():
+            if current != value:
+                field = obj._meta.get_field(name)
+                by_field.setdefault(field, []).append((obj, current, value))
+        for field, diff_list in by_field.items():
+            _apply_m2m_diff(field, diff_list)
+
+        by_model = {}
+        for (model, pk), obj in self.deactivated.items():
+            obj.modified = now
+            by_model.setdefault(model, []).append(pk)
+        for model, pk_list in by_model.items():
+            model.objects.filter(pk__in=pk_list).update(active=False, modified=now)
+
+
+def _apply_m2m_diff(field, diff_list):
+    """
+    Remove and add through table rows, given ``(obj, current, value)``
+    triples for the many to many ``field``.
+    """
+    through = field.remote_field.through
+    source = field.m2m_field_name() + "_id"
+    target = field.m2m_reverse_field_name() + "_id"
+    remove = Q()
+    add = []
+    for obj, current, value in diff_list:
+        removed = [o.pk for o in current - value]
+        if removed:
+            remove |= Q(**{source: obj.pk, target + "__in": removed})
+        add.extend(through(**{source: obj.pk, target: o.pk}) for o in value - current)
+    if remove:
+        through.objects.filter(remove).delete()
+    if add:
+        through.objects.bulk_create(add)
+
+
+#######################
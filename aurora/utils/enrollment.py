@@ -1,7 +1,25 @@
 #######################
 from __future__ import print_function, unicode_literals
 
+import threading
+import time
+
+from .. import conf
 from . import aurora_scrape
+from .pool import imap_ordered
+
+#######################
+
+try:
+    # Python 3:
+    from http.client import HTTPException
+except ImportError:
+    # Python 2:
+    from httplib import HTTPException
+
+# Network trouble is worth retrying; anything else (e.g., an unexpected
+#   page layout) is not.
+RETRY_EXCEPTIONS = (IOError, HTTPException)
 
 #######################
 
@@ -19,3 +37,93 @@ def get_enrollment(section):
     term = section.term.get_term_display().lower()
 
     return aurora_scrape.enrollment_info(crn, year, term)
+
+
+#######################
+
+
+class RateLimiter(object):
+    """
+    Space out calls to ``wait()`` so there are at most ``rate`` per second,
+    over all threads sharing this limiter.
+    A ``rate`` of ``None`` (or 0) means no limit.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_time = time.time()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.time()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+#######################
+
+
+def fetch_enrollment(crn, year, term_name, rate_limiter=None, retries=0, backoff=1.0):
+    """
+    Like ``aurora_scrape.enrollment_info()``, but wait for the
+    ``rate_limiter`` before each request, and retry network failures
+    up to ``retries`` times with exponential backoff.
+    """
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        try:
+            return aurora_scrape.enrollment_info(crn, year, term_name)
+        except RETRY_EXCEPTIONS:
+            if attempt >= retries:
+                raise
+            time.sleep(backoff * 2**attempt)
+            attempt += 1
+
+
+def collect_enrollment(section_list, workers=None, rate=None):
+    """
+    Fetch live enrollment numbers for every section in ``section_list``
+    concurrently.
+
+    Yields ``(section, result, error)`` triples in the order of
+    ``section_list``; ``result`` is the sextet returned by
+    ``aurora_scrape.enrollment_info()``, or ``None`` if the fetch failed
+    (``error`` is then the exception).
+
+    ``workers`` and ``rate`` default to the ``enrollment:workers`` and
+    ``enrollment:rate`` settings.
+    """
+    if workers is None:
+        workers = conf.get("enrollment:workers")
+    if rate is None:
+        rate = conf.get("enrollment:rate")
+    rate_limiter = RateLimiter(rate)
+    retries = conf.get("enrollment:retries")
+    backoff = conf.get("enrollment:retry_backoff")
+
+    # Resolve everything that needs the database in this thread.
+    section_list = list(section_list)
+    args_list = [
+        (
+            section.crn,
+            section.term.year,
+            section.term.get_term_display().lower(),
+            rate_limiter,
+            retries,
+            backoff,
+        )
+        for section in section_list
+    ]
+    results = imap_ordered(fetch_enrollment, args_list, workers)
+    for section, (_, future) in zip(section_list, results):
+        try:
+            yield section, future.result(), None
+        except Exception as e:
+            yield section, None, e
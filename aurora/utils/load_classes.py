@@ -3,6 +3,10 @@
 # This module converts aurora records (from .aurora_scrape)
 # into usuable objects.
 #
+# Records are loaded a term at a time: existing courses, sections and
+# schedules are fetched up front into a SyncContext, compared in memory,
+# and the changes are written with bulk operations in one transaction.
+#
 #######################
 from __future__ import print_function, unicode_literals
 
@@ -17,26 +21,287 @@ from classes.models import (
     Semester,
     Timeslot,
 )
+from classes.utils import termcache
+from django.db import transaction
 from django.template.defaultfilters import slugify
+from django.utils import timezone
 from django.utils.encoding import force_text
 from people.models import EmailAddress, Person
 from places.models import ClassRoom
 
 from .. import conf
-from ..models import (
-    AuroraCampus,
-    AuroraDateRange,
-    AuroraDepartment,
-    AuroraInstructor,
-    AuroraLocation,
-    AuroraTimeslot,
-)
-from .aurora_scrape import fetch_catalog_entry
+from ..models import AuroraCampus
+from .catalog import CatalogCache, description_changed, entry_url
+from .changeset import Changeset
+from .resolver import SyncResolver
 
 #######################
 
+DRY_RUN_KEY = "Changes (dry run, not saved)"
+
+#######################
+
+
+class SyncContext(object):
+    """
+    The state of a single ``load_classes()`` run for a term.
 
-def check_record(record, verbosity):
+    Existing courses, sections and schedules are fetched once per
+    department; aurora strings are resolved by a ``SyncResolver``
+    (pass one in to share it between the runs of a sync).
+    New and changed objects are only recorded here (in ``changes``),
+    ``apply()`` writes them all.
+    """
+
+    def __init__(self, semester, verbosity=0, resolver=None):
+        self.semester = semester
+        self.verbosity = verbosity
+        if resolver is None:
+            resolver = SyncResolver(verbosity)
+        self.resolver = resolver
+        self._blacklisted = {}
+        self._tba = {}
+        self._departments = set()
+        self.schedule_types = {obj.name: obj for obj in ScheduleType.objects.all()}
+        self.courses = {}  # (department_id, code) -> Course
+        self.sections = {}  # (department_id, course code, section_name) -> Section
+        self.schedules = {}  # id(section) -> [SectionSchedule, ...]
+        self.catalog = CatalogCache()
+        self.described = set()  # course keys with descriptions checked
+        self.changes = Changeset()
+
+    # lookups ##########################################################
+
+    def is_blacklisted(self, campus):
+        """
+        Memoized ``AuroraCampus.objects.is_blacklisted(campus)``
+        """
+        if campus not in self._blacklisted:
+            self._blacklisted[campus] = AuroraCampus.objects.is_blacklisted(campus)
+        return self._blacklisted[campus]
+
+    def tba(self, model):
+        """
+        Memoized ``model.objects.TBA()``
+        """
+        if model not in self._tba:
+            self._tba[model] = model.objects.TBA()
+        return self._tba[model]
+
+    def schedule_type(self, name):
+        """
+        Like ``ScheduleType.objects.get_or_create(name=name)``.
+        """
+        if name in self.schedule_types:
+            return self.schedule_types[name], False
+        obj = ScheduleType.objects.create(name=name)
+        self.schedule_types[name] = obj
+        return obj, True
+
+    # existing data ####################################################
+
+    def load_department(self, department):
+        """
+        Fetch the courses, and this term's sections and schedules,
+        of the department.
+        """
+        if department.pk in self._departments:
+            return
+        self._departments.add(department.pk)
+        courses_by_pk = {}
+        for course in Course.objects.filter(department=department):
+            self.courses.setdefault((department.pk, course.code), course)
+            courses_by_pk[course.pk] = course
+        by_pk = {}
+        for section in Section.objects.filter(
+            term=self.semester, course__department=department
+        ).prefetch_related("additional_instructors"):
+            # the courses are already loaded; no query per section.
+            section.course = courses_by_pk[section.course_id]
+            key = (department.pk, section.course.code, section.section_name)
+            if key in self.sections:
+                continue
+            self.sections[key] = section
+            self.schedules[id(section)] = []
+            by_pk[section.pk] = section
+        schedule_qs = (
+            SectionSchedule.objects.filter(section__in=list(by_pk))
+            .select_related("room", "instructor", "timeslot", "type", "date_range")
+            .prefetch_related("additional_instructors")
+        )
+        for sched in schedule_qs:
+            sched.section = by_pk[sched.section_id]
+            self.schedules[id(sched.section)].append(sched)
+
+    def get_or_create_course(self, department, code, defaults):
+        """
+        Like ``Course.objects.get_or_create()``; new courses are saved
+        by ``apply()``.
+        """
+        self.load_department(department)
+        key = (department.pk, code)
+        if key in self.courses:
+            return self.courses[key], False
+        course = Course(department=department, code=code, **defaults)
+        self.courses[key] = course
+        self.changes.create(course)
+        return course, True
+
+    def get_or_create_section(self, course, section_name, defaults):
+        """
+        Like ``Section.objects.get_or_create()`` for this term; new
+        sections are saved by ``apply()``.
+        """
+        key = (course.department_id, course.code, section_name)
+        if key in self.sections:
+            return self.sections[key], False
+        section = Section(
+            course=course, section_name=section_name, term=self.semester, **defaults
+        )
+        section.update_section_type()
+        self.sections[key] = section
+        self.schedules[id(section)] = []
+        self.changes.create(section)
+        return section, True
+
+    def section_schedules(self, section):
+        """
+        All schedules of the section, existing and new.
+        """
+        return self.schedules[id(section)]
+
+    def get_or_create_schedule(self, section, defaults):
+        """
+        Like ``SectionSchedule.objects.get_or_create()``, keyed on the
+        section, type, date range and timeslot.  New schedules are saved
+        by ``apply()``.
+        """
+        for sched in self.section_schedules(section):
+            if (
+                sched.type == defaults["type"]
+                and sched.date_range == defaults["date_range"]
+                and sched.timeslot == defaults["timeslot"]
+            ):
+                return sched, False
+        sched = SectionSchedule(**defaults)
+        self.schedules[id(section)].append(sched)
+        self.changes.create(sched)
+        return sched, True
+
+    # changes ##########################################################
+
+    def changed(self, obj, *fields):
+        """
+        Record that ``fields`` of ``obj`` need to be written.
+        """
+        self.changes.update(obj, *fields)
+
+    def additional_instructors(self, obj):
+        """
+        The additional instructors of a section or schedule, including
+        changes not yet written.
+        """
+        key = (type(obj), id(obj), "additional_instructors")
+        if key in self.changes.m2m:
+            return list(self.changes.m2m[key][3])
+        if obj.pk is None:
+            return []
+        return list(obj.additional_instructors.all())
+
+    def set_additional_instructors(self, obj, person_list):
+        self.changes.set_m2m(
+            obj,
+            "additional_instructors",
+            self.additional_instructors(obj),
+            person_list,
+        )
+
+    # writing ##########################################################
+
+    def apply(self):
+        """
+        Write all recorded changes, in bulk, in a single transaction.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            self.resolver.flush()
+            new_courses = self.changes.new(Course)
+            if new_courses:
+                Course.objects.bulk_create(new_courses)
+                _assign_pks(
+                    new_courses,
+                    Course.objects.filter(
+                        department_id__in=self._departments,
+                        code__in=[c.code for c in new_courses],
+                    ),
+                    lambda obj: (obj.department_id, obj.code),
+                )
+
+            new_sections = self.changes.new(Section)
+            for section in new_sections:
+                section.course = section.course  # the course may be new.
+            if new_sections:
+                Section.objects.bulk_create(new_sections)
+                _assign_pks(
+                    new_sections,
+                    Section.objects.filter(
+                        term=self.semester,
+                        course_id__in=set(s.course_id for s in new_sections),
+                    ),
+                    lambda obj: (obj.course_id, obj.section_name),
+                )
+
+            new_schedules = self.changes.new(SectionSchedule)
+            for sched in new_schedules:
+                sched.section = sched.section  # the section may be new.
+            if new_schedules:
+                known = set(
+                    sched.pk
+                    for sched_list in self.schedules.values()
+                    for sched in sched_list
+                    if sched.pk is not None
+                )
+                SectionSchedule.objects.bulk_create(new_schedules)
+                _assign_pks(
+                    new_schedules,
+                    SectionSchedule.objects.filter(
+                        section_id__in=set(s.section_id for s in new_schedules)
+                    ).exclude(pk__in=known),
+                    lambda obj: (
+                        obj.section_id,
+                        obj.type_id,
+                        obj.date_range_id,
+                        obj.timeslot_id,
+                    ),
+                )
+
+            self.changes.apply(now)
+            # bulk writes send no signals; recompute the active intervals.
+            Section.objects.filter(
+                pk__in=[s.pk for s in self.sections.values() if s.pk is not None]
+            ).refresh_active_interval()
+
+
+def _assign_pks(obj_list, queryset, key):
+    """
+    ``bulk_create()`` only sets primary keys on some databases;
+    look up the rest using ``key(obj)``.
+    """
+    pending = {key(obj): obj for obj in obj_list if obj.pk is None}
+    if not pending:
+        return
+    for obj in queryset:
+        new = pending.pop(key(obj), None)
+        if new is not None:
+            new.pk = obj.pk
+            new._state.adding = False
+            new._state.db = obj._state.db
+
+
+#######################
+
+
+def check_record(record, verbosity, context):
     """
     Returns a boolean indicated whether or not this record should be processed.
     """
@@ -48,7 +313,7 @@ def check_record(record, verbosity):
                 print("[!] rejecting record -- no campus")
             return False
 
-    if AuroraCampus.objects.is_blacklisted(record["campus"]):
+    if context.is_blacklisted(record["campus"]):
         if verbosity > 1:
             print("[!] rejecting course record -- AuroraCampus is Blacklisted.")
         return False
@@ -60,48 +325,67 @@ def check_record(record, verbosity):
     return True
 
 
-_course_desc_cache = None
-
-
-def load_course(record):
+def load_course(record, context):
     """
     Load a course object from the aurora_scrape record.
     Returns the course and a list of warnings associated with the load.
 
     This function creates a course if it doesn't exist.
     """
-    global _course_desc_cache
-
     warnings = []
     course_name = record["class_name"]
     if " " not in course_name:
         pprint(record)
         return None, ["Malformed course record.  Ignoring."]  # malformed record.
     dept_code, course_code = course_name.split(None, 1)
-    department, created = AuroraDepartment.objects.find(dept_code, create=False)
+    department, created = context.resolver.department(dept_code)
     course_verbose_name = record["class_verbosename"]
-    course, created_flag = Course.objects.get_or_create(
-        department=department,
-        code=course_code,
+    course, created_flag = context.get_or_create_course(
+        department,
+        course_code,
         defaults={"name": course_verbose_name, "slug": slugify(course_name)},
     )
     if created_flag:
         warnings.append("Course record created")
 
-    if course.pk not in _course_desc_cache:
+    key = (department.pk, course_code)
+    if key not in context.described:
         if not course.description and "catalog_entry_href" in record:
-            desc = fetch_catalog_entry(record["catalog_entry_href"])
-            if course.description != desc:
+            desc = context.catalog.get(entry_url(record["catalog_entry_href"]))
+            if description_changed(course.description, desc):
                 course.description = desc
-                course.save()
+                context.changed(course, "description")
                 warnings.append("Updated course description")
-        _course_desc_cache[course.pk] = True  # mark done
+        context.described.add(key)  # mark done
 
     # Do NOT reactivate courses.  If they are deactivated, they are deactivated
     #   for a reason!
     return course, warnings
 
 
+def prefetch_descriptions(record_list, context):
+    """
+    Fetch, all at once, the catalog entries ``load_course()`` will need:
+    those of courses without a description.
+    """
+    url_list = []
+    for record in record_list:
+        if "catalog_entry_href" not in record or " " not in record["class_name"]:
+            continue
+        if not check_record(record, 0, context):
+            continue
+        dept_code, course_code = record["class_name"].split(None, 1)
+        found = context.resolver.department(dept_code)
+        if found is None:
+            continue  # load_course() will complain.
+        department = found[0]
+        context.load_department(department)
+        course = context.courses.get((department.pk, course_code))
+        if course is None or not course.description:
+            url_list.append(entry_url(record["catalog_entry_href"]))
+    context.catalog.prefetch(url_list)
+
+
 def load_term(record):
     """
     Load a Semester object from the aurora_scrape record.
@@ -117,7 +401,7 @@ def load_term(record):
     return semester, warnings
 
 
-def load_term_date_range(schedule, verbosity):
+def load_term_date_range(schedule, verbosity, context):
     """
     Load a date_range object.
     """
@@ -127,14 +411,14 @@ def load_term_date_range(schedule, verbosity):
     schedule_date_range = schedule["date_range"]
     if verbosity > 2:
         print("schedule_date_range =", schedule_date_range)
-    date_range, created = AuroraDateRange.objects.find(schedule_date_range, create=True)
+    date_range, created = context.resolver.date_range(schedule_date_range, create=True)
     if created:
         warnings.append("Created semester date range: " + "{}".format(date_range))
     # print(repr(schedule_date_range), date_range)
     return date_range, warnings
 
 
-def load_instructors(record, verbosity):
+def load_instructors(record, verbosity, context):
     """
     Load an Instructor object from the aurora_scrape record.
 
@@ -162,7 +446,7 @@ def load_instructors(record, verbosity):
                     name, email_addr
                 )
             )
-        instructor, created = AuroraInstructor.objects.find(
+        instructor, created = context.resolver.instructor(
             name, email_addr, create=conf.get("create_instructors")
         )
         if created:
@@ -175,7 +459,7 @@ def load_instructors(record, verbosity):
     return instructor_list, warnings
 
 
-def load_timeslot(schedule, verbosity):
+def load_timeslot(schedule, verbosity, context):
     """
     Load an Timeslot object from the aurora_scrape record.
 
@@ -183,21 +467,21 @@ def load_timeslot(schedule, verbosity):
     """
     warnings = []
     if "days" not in schedule or "time" not in schedule:
-        return Timeslot.objects.TBA(), []
+        return context.tba(Timeslot), []
     days = schedule["days"]
     time = schedule["time"]
-    timeslot, created = AuroraTimeslot.objects.find(
+    timeslot, created = context.resolver.timeslot(
         days, time, create=conf.get("create_timeslots")
     )
     if not timeslot:
         warnings.append("Could not find timeslot: " + days + " @ " + time)
-        timeslot = Timeslot.objects.TBA()
+        timeslot = context.tba(Timeslot)
     if created:
         warnings.append("New timeslot object created for: {0} @ {1}".format(days, time))
     return timeslot, warnings
 
 
-def load_room(schedule, verbosity):
+def load_room(schedule, verbosity, context):
     """
     Load an ClassRoom object from the aurora_scrape record.
 
@@ -207,9 +491,9 @@ def load_room(schedule, verbosity):
     warnings = []
     where = schedule.get("where", None)
     if where is None:
-        return ClassRoom.objects.TBA(), []
+        return context.tba(ClassRoom), []
     try:
-        room, created = AuroraLocation.objects.find(
+        room, created = context.resolver.location(
             where, create=conf.get("create_classrooms")
         )
     except AssertionError as e:
@@ -219,14 +503,14 @@ def load_room(schedule, verbosity):
 
     if room is None:
         warnings.append("Could not find location: " + where)
-        room = ClassRoom.objects.TBA()
+        room = context.tba(ClassRoom)
     elif created:
         warnings.append("Created classroom object for location: {0}".format(where))
 
     return room, warnings
 
 
-def load_schedule_type(schedule, verbosity):
+def load_schedule_type(schedule, verbosity, context):
     """
     Load a ScheduleType from the record.
 
@@ -240,13 +524,13 @@ def load_schedule_type(schedule, verbosity):
         name = "(none)"
     else:
         name = schedule["type"]
-    obj, created = ScheduleType.objects.get_or_create(name=name)
+    obj, created = context.schedule_type(name)
     if created:
         warnings.append("Created new schedule type: %r" % name)
     return obj, warnings
 
 
-def load_schedule(section, record, warnings, verbosity):
+def load_schedule(section, record, warnings, verbosity, context):
     """
     Load the SectionSchedule
     """
@@ -265,7 +549,7 @@ def load_schedule(section, record, warnings, verbosity):
             ("type", "Schedule type", load_schedule_type),
             ("instructors", "Instructor", load_instructors),
         ):
-            data[data_name], subwarnings = load_function(sched_rec, verbosity)
+            data[data_name], subwarnings = load_function(sched_rec, verbosity, context)
             for warning in subwarnings:
                 warnings.append(verbose_name + ": " + warning)
 
@@ -276,31 +560,25 @@ def load_schedule(section, record, warnings, verbosity):
         primary_instructor = instructors[0] if instructors else None
         data["instructor"] = primary_instructor
         additional_instructors = instructors[1:]
-        sched, created = SectionSchedule.objects.get_or_create(
-            section=data["section"],
-            type=data["type"],
-            date_range=data["date_range"],
-            timeslot=data["timeslot"],
-            defaults=data,
-        )
+        sched, created = context.get_or_create_schedule(section, data)
 
         if sched.room != data["room"] and not sched.override_room:
             sched.room = data["room"]
             warnings.append("Schedule: Updated room to %s" % sched.room)
-            sched.save()
+            context.changed(sched, "room")
 
         if sched.instructor != primary_instructor and not sched.override_instructor:
             sched.instructor = primary_instructor
             warnings.append(
                 "Schedule: Updated instructor to {sched.instructor}".format(sched=sched)
             )
-            sched.save()
+            context.changed(sched, "instructor")
         # TODO: multiple instructors
         if (
-            set(sched.additional_instructors.all()) != set(additional_instructors)
+            set(context.additional_instructors(sched)) != set(additional_instructors)
             and not sched.override_instructor
         ):
-            sched.additional_instructors.set(additional_instructors)
+            context.set_additional_instructors(sched, additional_instructors)
             if additional_instructors:
                 l = [str(p) for p in additional_instructors]
                 s = ", ".join(l) if l else "---"
@@ -313,28 +591,27 @@ def load_schedule(section, record, warnings, verbosity):
         if sched.timeslot != data["timeslot"]:
             sched.timeslot = data["timeslot"]
             warnings.append("Schedule: Updated timeslot to %s" % sched.timeslot)
-            sched.save()
+            context.changed(sched, "timeslot")
 
         if not sched.active:
             sched.active = True
-            sched.save()
+            context.changed(sched, "active")
 
-        source_list.append(sched.pk)
+        source_list.append(id(sched))
 
     # now we also need to go through a second time for things that are in the
     # database but are no longer in banner/aurora.
 
-    for sched in SectionSchedule.objects.filter(section=section):
-        if sched.pk not in source_list:
+    for sched in context.section_schedules(section):
+        if id(sched) not in source_list:
             if sched.active:
-                sched.active = False
-                sched.save()
+                context.changes.deactivate(sched)
                 warnings.append(
                     "Schedule: Deactivated {0} (no longer valid)".format(sched)
                 )
 
 
-def load_section(record, term, verbosity):
+def load_section(record, term, verbosity, context):
     """
     Convert a top level record from aurora_scrape into a section object.
 
@@ -343,7 +620,7 @@ def load_section(record, term, verbosity):
     warnings = []
     data = {}
     data["active"] = True  # or True, if term is current...
-    course, subwarnings = load_course(record)
+    course, subwarnings = load_course(record, context)
     for warning in subwarnings:
         warnings.append("{}".format(course) + ": " + warning)
     if course is None:
@@ -352,7 +629,7 @@ def load_section(record, term, verbosity):
     section_name = record["class_section"]
     data["crn"] = record["class_crn"]
 
-    instructors, subwarnings = load_instructors(record, verbosity)
+    instructors, subwarnings = load_instructors(record, verbosity, context)
     data["instructor"] = instructors[0] if instructors else None
     additional_instructors = instructors[1:]
     for warning in subwarnings:
@@ -360,9 +637,7 @@ def load_section(record, term, verbosity):
 
     data["slug"] = slugify(course.slug + " " + section_name + " " + term.slug)
 
-    section, created_flag = Section.objects.get_or_create(
-        course=course, section_name=section_name, term=term, defaults=data
-    )
+    section, created_flag = context.get_or_create_section(course, section_name, data)
     if created_flag:
         warnings.append("Section object created")
     else:
@@ -372,21 +647,24 @@ def load_section(record, term, verbosity):
             if getattr(section, key) != value:
                 setattr(section, key, value)
                 warnings.append(key + ": value updated -> " + "{}".format(value))
-            section.save()
+                context.changed(section, key)
 
         if section.instructor != data["instructor"] and not section.override_instructor:
             if data["instructor"] is not None:
                 section.instructor = data["instructor"]
                 warnings.append("Updated instructor to %s" % section.instructor)
-                section.save()
+                context.changed(section, "instructor")
+
+        if section.update_section_type():
+            context.changed(section, "section_type")
 
     if (
-        set(section.additional_instructors.all()) != set(additional_instructors)
+        set(context.additional_instructors(section)) != set(additional_instructors)
         and not section.override_instructor
     ):
         if additional_instructors:
             # instructors may have been promoted by instructor_beat
-            section.additional_instructors.set(additional_instructors)
+            context.set_additional_instructors(section, additional_instructors)
             if additional_instructors:
                 l = [str(p) for p in additional_instructors]
                 s = ", ".join(l) if l else "---"
@@ -394,44 +672,84 @@ def load_section(record, term, verbosity):
             else:
                 warnings.append("Cleared additional instructors")
 
-    load_schedule(section, record, warnings, verbosity)
+    load_schedule(section, record, warnings, verbosity, context)
 
     return section, warnings
 
 
-def load_classes(year, term, dept_code, record_list, delete=False, verbosity=0):
+def load_classes(
+    year,
+    term,
+    dept_code,
+    record_list,
+    delete=False,
+    verbosity=0,
+    dry_run=False,
+    resolver=None,
+):
     """
     Load the data from aurora_scrape.  Return a dictionary of warnings.
+
+    With ``dry_run``, nothing is saved; the changes that would have been
+    made are reported under the ``DRY_RUN_KEY`` of the results.
+
+    ``resolver`` is a ``SyncResolver`` to share between the calls of one
+    sync, so the aurora mapping tables are only loaded once.
     """
-    global _course_desc_cache
-    _course_desc_cache = {}  # reset descriptions
     results = {}
 
     # print('load_classes(year={year!r}, term={term!r}, ...)')
 
     semester = Semester.objects.get_by_pair(year, term)
-    aurora_list = []
-    for course_record in record_list:
-        if not check_record(course_record, verbosity):
-            continue
-        section, warnings = load_section(course_record, semester, verbosity)
-        if verbosity > 1:
-            print("Loaded section {}".format(section))
-        results[section] = warnings
-        aurora_list.append(section)
-    # now go through and remove local entries no longer in aurora.
-    if delete:
-        for old_section in Section.objects.filter(
-            course__department__code=dept_code, term=semester
-        ):
-            if (old_section not in aurora_list) and (
-                old_section.section_type not in conf.get("delete:ignore_section_types")
+    record_list = list(record_list)
+    context = SyncContext(semester, verbosity, resolver)
+    prefetch_descriptions(record_list, context)
+    with transaction.atomic():
+        loaded_list = []
+        for course_record in record_list:
+            if not check_record(course_record, verbosity, context):
+                continue
+            section, warnings = load_section(
+                course_record, semester, verbosity, context
+            )
+            if verbosity > 1:
+                print("Loaded section {}".format(section))
+            loaded_list.append((section, warnings))
+        report = context.changes.report()
+        # new objects (and the records of anything the resolver created)
+        #   are rolled back for a dry run, but sections need a pk here.
+        context.apply()
+        # sections are only hashable once they are saved.
+        for section, warnings in loaded_list:
+            results[section] = warnings
+
+        # now go through and remove local entries no longer in aurora.
+        if delete:
+            aurora_pks = set(section.pk for section, _ in loaded_list if section)
+            for old_section in Section.objects.filter(
+                course__department__code=dept_code, term=semester
             ):
-                results["{}".format(old_section)] = [
-                    "DELETE section no longer available"
-                ]
-                old_section.delete()
-
+                if (old_section.pk not in aurora_pks) and (
+                    old_section.section_type
+                    not in conf.get("delete:ignore_section_types")
+                ):
+                    results["{}".format(old_section)] = [
+                        "DELETE section no longer available"
+                    ]
+                    report.append("Delete section: {}".format(old_section))
+                    if not dry_run:
+                        old_section.delete()
+
+        if dry_run:
+            transaction.set_rollback(True)
+            # the mappings (and objects) resolved in this run are gone.
+            context.resolver.discard()
+            results[DRY_RUN_KEY] = report
+            return results
+
+    context.resolver.commit()
+    # whatever changed, cached pages for the term are now out of date.
+    termcache.invalidate(semester.pk)
     return results
 
 
@@ -0,0 +1,88 @@
+"""
+A bounded worker pool for fetching banner pages concurrently.
+
+Only network fetches and HTML parsing should be run in the pool;
+all database work must stay in the calling thread.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from aurora import conf
+
+#######################
+
+try:
+    # Python 3:
+    from urllib.parse import urlparse
+except ImportError:
+    # Python 2:
+    from urlparse import urlparse
+
+##########################################################
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def host_semaphore(url):
+    """
+    Return the semaphore which caps the number of simultaneous
+    connections to the host of ``url``.
+    """
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            limit = conf.get("banner:max_connections_per_host")
+            _host_semaphores[host] = threading.BoundedSemaphore(limit)
+        return _host_semaphores[host]
+
+
+##########################################################
+
+
+def _run_inline(func, args):
+    """
+    Run ``func(*args)`` in this thread, but return a completed future,
+    so the caller does not need to care whether a pool was used.
+    """
+    future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def imap_ordered(func, args_list, workers=None):
+    """
+    Run ``func(*args)`` for every ``args`` in ``args_list``, using at
+    most ``workers`` threads (default: the ``sync:workers`` setting).
+
+    Yields ``(args, future)`` pairs in the same order as ``args_list``,
+    regardless of which call finishes first, so output derived from the
+    results is deterministic.  Calls later in the list continue to run
+    while the consumer is processing earlier results.
+    Exceptions are re-raised by ``future.result()``.
+    """
+    if workers is None:
+        workers = conf.get("sync:workers")
+    args_list = [tuple(args) for args in args_list]
+    if workers <= 1:
+        for args in args_list:
+            yield args, _run_inline(func, args)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        future_list = [executor.submit(func, *args) for args in args_list]
+        try:
+            for args, future in zip(args_list, future_list):
+                yield args, future
+        finally:
+            # consumer gave up early: do not start anything else.
+            for future in future_list:
+                future.cancel()
+
+
+##########################################################
@@ -0,0 +1,201 @@
+# -*- encoding: utf-8
+#
+# Sync-scoped resolution of aurora strings to local objects.
+#
+# The ``find()`` methods of the aurora mapping managers make several
+# queries per call, and a sync resolves the same handful of rooms,
+# timeslots and instructors thousands of times.  A SyncResolver loads
+# every mapping row up front, remembers the answer (including "not
+# found") for each string, and writes only the mapping rows that are new.
+#
+#######################
+from __future__ import print_function, unicode_literals
+
+from ..models import (
+    AuroraDateRange,
+    AuroraDepartment,
+    AuroraInstructor,
+    AuroraLocation,
+    AuroraTimeslot,
+)
+
+#######################
+
+
+class SyncResolver(object):
+    """
+    Drop in for the ``find()`` methods of the aurora mapping managers,
+    for the duration of one sync.  Call ``flush()`` to save the new
+    mapping rows.
+    """
+
+    def __init__(self, verbosity=0):
+        self.verbosity = verbosity
+        self.departments = {
+            obj.department_code: obj.department
+            for obj in AuroraDepartment.objects.select_related("department")
+        }
+        self.instructors = {
+            obj.instructor: obj.person
+            for obj in AuroraInstructor.objects.select_related("person")
+        }
+        self.locations = {
+            obj.location: obj.classroom
+            for obj in AuroraLocation.objects.select_related("classroom")
+        }
+        self.timeslots = {
+            (obj.schedule_days, obj.schedule_time): obj.timeslot
+            for obj in AuroraTimeslot.objects.select_related("timeslot")
+        }
+        self.date_ranges = {
+            obj.schedule_date_range: obj.date_range
+            for obj in AuroraDateRange.objects.select_related("date_range")
+        }
+        self._missing = {}  # (model, key) -> None, or the AssertionError
+        self._new = []
+        self._added = []  # (mapping dict, key), since the last commit()
+
+    def _resolve(self, model, mapped, key, resolve, make_mapping):
+        """
+        Common lookup: the mapping table, then remembered misses, then
+        the manager's ``resolve()``.
+        """
+        if key in mapped:
+            return mapped[key], False
+        if (model, key) in self._missing:
+            error = self._missing[model, key]
+            if error is not None:
+                raise error
+            return None, False
+        try:
+            obj, created = resolve()
+        except AssertionError as e:
+            self._missing[model, key] = e
+            raise
+        if obj is None:
+            self._missing[model, key] = None
+            return obj, created
+        mapped[key] = obj
+        self._added.append((mapped, key))
+        self._new.append(make_mapping(obj))
+        return obj, created
+
+    def department(self, department_code):
+        """
+        Like ``AuroraDepartment.objects.find(department_code)``.
+        """
+        manager = AuroraDepartment.objects
+
+        def resolve():
+            return manager.resolve(department_code), False
+
+        obj, created = self._resolve(
+            AuroraDepartment,
+            self.departments,
+            department_code,
+            resolve,
+            lambda obj: AuroraDepartment(
+                department_code=department_code, department=obj
+            ),
+        )
+        if obj is None:
+            return None  # as the manager does.
+        return obj, created
+
+    def instructor(self, instructor, email_addr, create=False):
+        """
+        Like ``AuroraInstructor.objects.find(instructor, email_addr, create)``.
+        """
+        manager = AuroraInstructor.objects
+
+        def resolve():
+            person, created = manager.resolve(
+                instructor, email_addr, create=create, verbosity=self.verbosity
+            )
+            if person is not None and not created:
+                person.add_flag_by_name("instructor", "Available to instruct courses")
+            return person, created
+
+        return self._resolve(
+            AuroraInstructor,
+            self.instructors,
+            instructor,
+            resolve,
+            lambda obj: AuroraInstructor(instructor=instructor, person=obj),
+        )
+
+    def location(self, location, create=False):
+        """
+        Like ``AuroraLocation.objects.find(location, create)``.
+        """
+        return self._resolve(
+            AuroraLocation,
+            self.locations,
+            location,
+            lambda: AuroraLocation.objects.resolve(location, create=create),
+            lambda obj: AuroraLocation(location=location, classroom=obj),
+        )
+
+    def timeslot(self, schedule_days, schedule_time, create=False):
+        """
+        Like ``AuroraTimeslot.objects.find(schedule_days, schedule_time, create)``.
+        """
+        return self._resolve(
+            AuroraTimeslot,
+            self.timeslots,
+            (schedule_days, schedule_time),
+            lambda: AuroraTimeslot.objects.resolve(
+                schedule_days, schedule_time, create=create
+            ),
+            lambda obj: AuroraTimeslot(
+                schedule_days=schedule_days, schedule_time=schedule_time, timeslot=obj
+            ),
+        )
+
+    def date_range(self, schedule_date_range, create=False):
+        """
+        Like ``AuroraDateRange.objects.find(schedule_date_range, create)``.
+        """
+        return self._resolve(
+            AuroraDateRange,
+            self.date_ranges,
+            schedule_date_range,
+            lambda: AuroraDateRange.objects.resolve(schedule_date_range, create=create),
+            lambda obj: AuroraDateRange(
+                schedule_date_range=schedule_date_range, date_range=obj
+            ),
+        )
+
+    def flush(self):
+        """
+        Save the mapping rows discovered since the last flush.
+        Returns the number of rows written.
+        """
+        count = len(self._new)
+        by_model = {}
+        for obj in self._new:
+            by_model.setdefault(type(obj), []).append(obj)
+        for model, obj_list in by_model.items():
+            model.objects.bulk_create(obj_list)
+        self._new = []
+        return count
+
+    def commit(self):
+        """
+        The work since the last ``commit()`` was committed;
+        keep what was resolved.
+        """
+        self._added = []
+
+    def discard(self):
+        """
+        The work since the last ``commit()`` was rolled back; forget what
+        was resolved (it may refer to rows which no longer exist).
+        """
+        for mapped, key in self._added:
+            mapped.pop(key, None)
+        self._added = []
+        self._new = []
+
+
+#######################
@@ -0,0 +1,386 @@
+"""
+The HTTP transport used to fetch banner pages.
+
+``HTTPTransport`` keeps connections alive (one pool per thread, one
+connection per host), asks for gzip'd responses and applies a timeout.
+``CachingTransport`` wraps another transport with an on-disk response
+cache keyed by URL and POST body, with an expiry time; enable it with
+the ``banner:cache_dir`` setting.
+
+``RecordingTransport`` saves every response in a directory, and
+``ReplayTransport`` serves them back with no network at all (see also
+``serve_recordings()``, a local HTTP stand-in for banner).  Enable
+these with the ``banner:record_dir`` or ``banner:replay_dir`` settings.
+
+Use ``get_transport()``; ``set_transport()`` replaces it (e.g., in
+tests, or for recording responses).
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+
+from aurora import conf
+
+#######################
+
+try:
+    # Python 3:
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urljoin, urlparse
+    from urllib.error import HTTPError, URLError
+except ImportError:
+    # Python 2:
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urljoin, urlparse
+    from urllib2 import HTTPError, URLError
+
+##########################################################
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+RECORDING_INDEX = "index.jsonl"
+
+USER_AGENT = "django-dept-classes aurora sync"
+
+_transport = None
+_transport_lock = threading.Lock()
+
+##########################################################
+
+
+def get_transport():
+    """
+    Return the transport used for banner requests, building it from
+    the settings on first use.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = build_transport(
+                replay_dir=conf.get("banner:replay_dir"),
+                record_dir=conf.get("banner:record_dir"),
+                cache_dir=conf.get("banner:cache_dir"),
+            )
+        return _transport
+
+
+def build_transport(replay_dir=None, record_dir=None, cache_dir=None):
+    """
+    Build a transport: replaying from ``replay_dir``, if given;
+    otherwise over HTTP, recording to ``record_dir`` and/or caching in
+    ``cache_dir``.
+    """
+    if replay_dir:
+        return ReplayTransport(replay_dir)
+    transport = HTTPTransport(timeout=conf.get("banner:timeout"))
+    if record_dir:
+        transport = RecordingTransport(transport, record_dir)
+    if cache_dir:
+        transport = CachingTransport(transport, cache_dir, conf.get("banner:cache_ttl"))
+    return transport
+
+
+def set_transport(transport):
+    """
+    Replace the transport used for banner requests; returns the
+    previous one.  ``None`` restores the default on next use.
+    """
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+        return previous
+
+
+def request_key(url, data=None):
+    """
+    The key for a request, used to name cache and recording files.
+    """
+    key = hashlib.sha1(url.encode("utf-8"))
+    if data is not None:
+        key.update(b"\0")
+        key.update(data)
+    return key.hexdigest()
+
+
+def _write_file(directory, name, body):
+    """
+    Write ``body`` to ``directory/name``, via a temporary file so
+    other threads (or processes) never read a partial body.
+    """
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            pass  # created by another thread.
+    fd, tmp_path = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        f.write(body)
+    os.rename(tmp_path, os.path.join(directory, name))
+
+
+##########################################################
+
+
+class HTTPTransport(object):
+    """
+    Fetch urls over persistent connections.  Safe to use from several
+    threads: each thread has its own connections.
+    """
+
+    def __init__(self, timeout=None, max_redirects=5):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._local = threading.local()
+
+    def _connections(self):
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _connection(self, scheme, netloc):
+        connections = self._connections()
+        key = (scheme, netloc)
+        if key not in connections:
+            factory = HTTPSConnection if scheme == "https" else HTTPConnection
+            connections[key] = factory(netloc, timeout=self.timeout)
+        return connections[key]
+
+    def _discard(self, scheme, netloc):
+        conn = self._connections().pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(self, url, data):
+        parts = urlparse(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {"Accept-Encoding": "gzip", "User-Agent": USER_AGENT}
+        if data is not None:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        method = "GET" if data is None else "POST"
+        # A kept-alive connection may have been closed by the server
+        #   since it was last used; so try again on a fresh one, once.
+        for retry in (True, False):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, data, headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (HTTPException, IOError):
+                self._discard(parts.scheme, parts.netloc)
+                if retry:
+                    continue
+                raise
+            break
+        if (response.getheader("Connection") or "").lower() == "close":
+            self._discard(parts.scheme, parts.netloc)
+        if (response.getheader("Content-Encoding") or "").lower() == "gzip":
+            body = gzip.GzipFile(fileobj=io.BytesIO(body)).read()
+        return response, body
+
+    def fetch(self, url, data=None):
+        """
+        Fetch ``url`` (POSTing ``data``, if given) and return the body.
+        Redirects are followed; error responses raise ``HTTPError``.
+        """
+        for i in range(self.max_redirects + 1):
+            response, body = self._request(url, data)
+            location = response.getheader("Location")
+            if response.status in REDIRECT_CODES and location:
+                url = urljoin(url, location)
+                if response.status in (301, 302, 303):
+                    data = None
+                continue
+            if response.status >= 400:
+                raise HTTPError(
+                    url, response.status, response.reason, response.msg, None
+                )
+            return body
+        raise URLError("Too many redirects: {0}".format(url))
+
+    def close(self):
+        """
+        Close this thread's connections.
+        """
+        for key in list(self._connections()):
+            self._discard(*key)
+
+
+##########################################################
+
+
+class CachingTransport(object):
+    """
+    Wrap ``transport`` with an on-disk cache of response bodies.
+    Entries older than ``ttl`` seconds are refetched (``None`` means
+    they never expire).  Only successful responses are cached.
+    """
+
+    def __init__(self, transport, directory, ttl=None):
+        self.transport = transport
+        self.directory = directory
+        self.ttl = ttl
+
+    def path(self, url, data=None):
+        """
+        The cache file for the given request.
+        """
+        return os.path.join(self.directory, request_key(url, data))
+
+    def get(self, url, data=None):
+        """
+        Return the cached body, or ``None``.
+        """
+        path = self.path(url, data)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+    def set(self, url, data, body):
+        _write_file(self.directory, request_key(url, data), body)
+
+    def fetch(self, url, data=None):
+        body = self.get(url, data)
+        if body is None:
+            body = self.transport.fetch(url, data)
+            self.set(url, data, body)
+        return body
+
+    def clear(self):
+        """
+        Remove all cached responses.
+        """
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, name))
+
+
+##########################################################
+
+
+class RecordingTransport(object):
+    """
+    Wrap ``transport``, saving every response body in ``directory``
+    (as ``<key>.html``), along with an index of the requests made.
+    """
+
+    def __init__(self, transport, directory):
+        self.transport = transport
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def fetch(self, url, data=None):
+        body = self.transport.fetch(url, data)
+        key = request_key(url, data)
+        _write_file(self.directory, key + ".html", body)
+        entry = {
+            "key": key,
+            "url": url,
+            "data": data.decode("utf-8") if data is not None else None,
+        }
+        with self._lock:
+            with open(os.path.join(self.directory, RECORDING_INDEX), "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        return body
+
+
+class ReplayTransport(object):
+    """
+    Serve response bodies saved by a ``RecordingTransport``.
+    Requests which were not recorded raise ``URLError``.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, url, data=None):
+        path = os.path.join(self.directory, request_key(url, data) + ".html")
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except (IOError, OSError):
+            raise URLError("No recording for {0}".format(url))
+
+
+def read_recording_index(directory):
+    """
+    Return a list of the ``{"key", "url", "data"}`` entries of the
+    recordings in ``directory``; the last entry for a key wins.
+    """
+    entries = {}
+    with open(os.path.join(directory, RECORDING_INDEX)) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry["key"]] = entry
+    return list(entries.values())
+
+
+##########################################################
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def serve_recordings(directory, address="127.0.0.1", port=8000):
+    """
+    Return an HTTP server (call its ``serve_forever()``) which answers
+    the requests recorded in ``directory``, matching on the path, query
+    and POST body, but not the host.  Point ``banner:root_uri`` at it to
+    exercise the real network code without banner.
+    """
+    bodies = {}
+    for entry in read_recording_index(directory):
+        parts = urlparse(entry["url"])
+        data = entry["data"].encode("utf-8") if entry["data"] is not None else None
+        bodies[parts.path, parts.query, data] = entry["key"]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, data):
+            parts = urlparse(self.path)
+            key = bodies.get((parts.path, parts.query, data))
+            if key is None:
+                self.send_error(404, "Not recorded")
+                return
+            with open(os.path.join(directory, key + ".html"), "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._respond(None)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self._respond(self.rfile.read(length))
+
+        def log_message(self, format, *args):
+            pass
+
+    return _ThreadingHTTPServer((address, port), Handler)
+
+
+##########################################################
@@ -30,6 +30,7 @@ from .models import (
     SemesterDateRange,
     Timeslot,
 )
+from .utils import autolink, occurrences, prereqgraph, semesters, termcache
 from .views import PrintSemesterSchedule
 
 #######################
@@ -264,11 +265,31 @@ class SectionSemesterFilter(SemesterFilter):
 ##############################################################
 
 
+def invalidate_caches(queryset):
+    """
+    Discard the cached data which depends on the rows of ``queryset``;
+    ``QuerySet.update()`` does not send the signals which would.
+    """
+    termcache.invalidate_queryset(queryset)
+    if queryset.model is Semester:
+        semesters.invalidate()
+    if queryset.model in (ImportantDate, SemesterDateRange, Timeslot):
+        occurrences.invalidate()
+    if queryset.model in (Course, Department):
+        autolink.invalidate()
+    if queryset.model in (Course, Department, Prerequisite, Requisite):
+        prereqgraph.invalidate()
+
+
+##############################################################
+
+
 def mark_inactive(modeladmin, request, queryset):
     """
     Mark selected items as inactive
     """
     queryset.update(active=False)
+    invalidate_caches(queryset)
 
 
 mark_inactive.short_description = mark_inactive.__doc__.strip()
@@ -281,6 +302,7 @@ def mark_active(modeladmin, request, queryset):
     Mark selected items as active
     """
     queryset.update(active=True)
+    invalidate_caches(queryset)
 
 
 mark_active.short_description = mark_active.__doc__.strip()
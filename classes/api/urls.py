@@ -6,7 +6,19 @@ from __future__ import print_function, unicode_literals
 
 from django.conf.urls import url
 
-from .views import important_dates_all, important_dates_detail, important_dates_future
+from .views import (
+    course_prerequisite_levels,
+    course_prerequisites,
+    courses,
+    enrollment,
+    important_dates_all,
+    important_dates_detail,
+    important_dates_future,
+    important_dates_sync,
+    schedules,
+    sections,
+    semesters,
+)
 
 #######################
 
@@ -21,9 +33,29 @@ urlpatterns = [
         important_dates_future,
         name="classes-api-important-dates-future",
     ),
+    url(
+        r"^important-dates/sync/$",
+        important_dates_sync,
+        name="classes-api-important-dates-sync",
+    ),
     url(
         r"^important-dates/(?P<pk>\d+)/$",
         important_dates_detail,
         name="classes-api-important-dates-detail",
     ),
+    url(
+        r"^courses/prerequisite-levels/$",
+        course_prerequisite_levels,
+        name="classes-api-course-prerequisite-levels",
+    ),
+    url(
+        r"^courses/(?P<slug>[\w-]+)/prerequisites/$",
+        course_prerequisites,
+        name="classes-api-course-prerequisites",
+    ),
+    url(r"^courses/$", courses, name="classes-api-courses"),
+    url(r"^semesters/$", semesters, name="classes-api-semesters"),
+    url(r"^sections/$", sections, name="classes-api-sections"),
+    url(r"^schedules/$", schedules, name="classes-api-schedules"),
+    url(r"^enrollment/$", enrollment, name="classes-api-enrollment"),
 ]
@@ -8,13 +8,30 @@ import datetime
 import json
 
 from django import http
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.db.models import Model
+from django.db.models import Model, Q
 from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.generic.detail import BaseDetailView
+from django.views.generic.base import View
 from django.views.generic.list import BaseListView
 
-from ..models import ImportantDate
+from .. import conf
+from ..models import (
+    Course,
+    Department,
+    Enrollment,
+    ImportantDate,
+    Prerequisite,
+    Requisite,
+    Section,
+    SectionSchedule,
+    Semester,
+)
+from ..utils import prereqgraph
+from ..utils.conditional import ConditionalGetMixin
 
 #######################
 #################################################################
@@ -46,6 +63,16 @@ class JSONResponseMixin(object):
             return "{}".format(value)
         return value
 
+    def json_default(self, value):
+        """
+        ``default`` for ``json.JSONEncoder``: only called for values
+        which json cannot encode itself.
+        """
+        result = self.json_safe_value(value)
+        if result is value:
+            raise TypeError("{!r} is not JSON serializable".format(value))
+        return result
+
     def convert_context_to_json(self, context):
         "Convert the context dictionary into a JSON object"
         # Note: This is *EXTREMELY* naive; in reality, you'll need
@@ -60,7 +87,7 @@ class JSONResponseMixin(object):
 #################################################################
 
 
-class JSONDetailView(JSONResponseMixin, BaseDetailView):
+class JSONDetailView(ConditionalGetMixin, JSONResponseMixin, BaseDetailView):
     """
     Process the object. (It most be a model instance.)
     The object is required to have the as_dict() method.
@@ -83,7 +110,7 @@ class JSONDetailView(JSONResponseMixin, BaseDetailView):
 #################################################################
 
 
-class JSONListView(JSONResponseMixin, BaseListView):
+class JSONListView(ConditionalGetMixin, JSONResponseMixin, BaseListView):
     """
     Process the object_list. (It must be a queryset.)
     """
@@ -98,11 +125,164 @@ class JSONListView(JSONResponseMixin, BaseListView):
             )
         fields = [f.name for f in object_list.model._meta.fields]
         values_list = object_list.values_list(*fields)
-        data = [
-            dict(zip(fields, [self.json_safe_value(v) for v in values]))
-            for values in values_list
-        ]
-        return json.dumps(data)
+        data = [dict(zip(fields, values)) for values in values_list]
+        return json.dumps(data, default=self.json_default)
+
+
+#################################################################
+
+
+class StreamingJSONListView(ConditionalGetMixin, JSONResponseMixin, BaseListView):
+    """
+    Stream the object_list (a queryset) as JSON, a page at a time::
+
+        {"results": [{...}, ...], "next": "<url of the next page>"}
+
+    Pages are in primary key order, and ``next`` continues after the
+    last primary key of the page (keyset pagination), so paging is cheap
+    and stable while rows are added.  ``next`` is null on the last page.
+
+    With ``?modified_since=`` only the rows modified at or after that
+    time are returned, in ``(modified, pk)`` order, and ``next`` moves
+    ``modified_since`` forward; the last ``next`` is where the following
+    sync starts.  Deactivated rows are returned as tombstones::
+
+        {"id": 12, "active": false, "modified": "...", <tombstone_fields>}
+
+    Primary keys differ between installations, so ``tombstone_fields``
+    are the lookups (e.g., ``"course__slug"``) of a natural key.
+
+    Query parameters:
+        ``fields``: comma separated field names (default: all fields)
+        ``limit``: the page size (default: "api:page_size")
+        ``after``: only rows with a primary key greater than this
+            (with ``modified_since``: only for rows modified exactly then)
+        ``modified_since``: an ISO 8601 timestamp
+    """
+
+    chunk_size = 100  # rows per chunk of output
+    tombstone_fields = ()  # identify deactivated rows to other installations
+
+    def get_field_names(self, model):
+        """
+        The fields requested with ``?fields=``.
+        Raises ValueError for unknown fields.
+        """
+        all_fields = [f.name for f in model._meta.fields]
+        requested = self.request.GET.get("fields")
+        if not requested:
+            return all_fields
+        fields = [name.strip() for name in requested.split(",") if name.strip()]
+        for name in fields:
+            if name not in all_fields:
+                raise ValueError("Unknown field: {}".format(name))
+        return fields
+
+    def get_limit(self):
+        """
+        The page size requested with ``?limit=``.
+        Raises ValueError for a bad limit.
+        """
+        limit = self.request.GET.get("limit")
+        if limit is None:
+            return conf.get("api:page_size")
+        limit = int(limit)
+        if not (0 < limit <= conf.get("api:max_page_size")):
+            raise ValueError(
+                "limit must be between 1 and {}".format(conf.get("api:max_page_size"))
+            )
+        return limit
+
+    def get_modified_since(self):
+        """
+        The time requested with ``?modified_since=``, or ``None``.
+        Raises ValueError for a bad time.
+        """
+        value = self.request.GET.get("modified_since")
+        if not value:
+            return None
+        since = parse_datetime(value.strip())
+        if since is None:
+            raise ValueError("Invalid modified_since: {}".format(value))
+        if settings.USE_TZ and timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def get_rows(self, queryset, columns, limit, since):
+        """
+        The rows of the page, as ``(pk, modified, active, value, ...)``
+        tuples.
+        """
+        after = self.request.GET.get("after")
+        if since is None:
+            if after is not None:
+                queryset = queryset.filter(pk__gt=after)
+            queryset = queryset.order_by("pk")
+        else:
+            if after is not None:
+                queryset = queryset.filter(
+                    Q(modified__gt=since) | Q(modified=since, pk__gt=after)
+                )
+            else:
+                queryset = queryset.filter(modified__gte=since)
+            queryset = queryset.order_by("modified", "pk")
+        queryset = queryset.values_list("pk", "modified", "active", *columns)
+        return queryset[:limit].iterator()
+
+    def get_next_url(self, last_row, since):
+        query = self.request.GET.copy()
+        query["after"] = last_row[0]
+        if since is not None:
+            query["modified_since"] = last_row[1].isoformat()
+        return self.request.build_absolute_uri("?" + query.urlencode())
+
+    def stream_json(self, rows, fields, columns, limit, since):
+        """
+        Generate the encoded JSON document, a chunk of rows at a time.
+        """
+        encoder = json.JSONEncoder(default=self.json_default)
+        yield b'{"results": ['
+        separator = ""
+        count = 0
+        last_row = None
+        chunk = []
+        for row in rows:
+            last_row = row
+            values = dict(zip(columns, row[3:]))
+            if since is not None and not row[2]:
+                data = {"id": row[0], "active": False, "modified": row[1]}
+                data.update((name, values[name]) for name in self.tombstone_fields)
+            else:
+                data = {name: values[name] for name in fields}
+            chunk.append(encoder.encode(data))
+            count += 1
+            if len(chunk) >= self.chunk_size:
+                yield (separator + ",".join(chunk)).encode("utf-8")
+                separator = ","
+                chunk = []
+        if chunk:
+            yield (separator + ",".join(chunk)).encode("utf-8")
+        next_url = self.get_next_url(last_row, since) if count == limit else None
+        yield '], "next": {}}}'.format(encoder.encode(next_url)).encode("utf-8")
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        try:
+            fields = self.get_field_names(queryset.model)
+            columns = fields + [
+                name for name in self.tombstone_fields if name not in fields
+            ]
+            limit = self.get_limit()
+            since = self.get_modified_since()
+            rows = self.get_rows(queryset, columns, limit, since)
+        except ValueError as e:
+            return http.HttpResponseBadRequest(
+                "{}".format(e), content_type="text/plain"
+            )
+        return http.StreamingHttpResponse(
+            self.stream_json(rows, fields, columns, limit, since),
+            content_type="application/json",
+        )
 
 
 #################################################################
@@ -131,6 +311,26 @@ class ImportantDateFutureMixin(object):
     queryset = ImportantDate.objects.after(datetime.date.today())
 
 
+#################################################################
+
+
+class PrerequisiteGraphMixin(object):
+    """
+    Prerequisite graph mixin
+    """
+
+    def get_dependent_querysets(self):
+        return [
+            Course.objects.all(),
+            Department.objects.all(),
+            Requisite.objects.all(),
+            Prerequisite.objects.all(),
+        ]
+
+    def course_dict(self, course):
+        return {"label": course.label, "slug": course.slug, "name": course.name}
+
+
 #################################################################
 #################################################################
 ##### API Views
@@ -158,6 +358,132 @@ class ImportantDateDetailView(ImportantDateMixin, JSONDetailView):
 
 important_dates_detail = ImportantDateDetailView.as_view()
 
+
+class ImportantDatesSyncListView(StreamingJSONListView):
+    """
+    All important dates (including deactivated ones, as tombstones),
+    for mirroring with ``?modified_since=``.
+    """
+
+    queryset = ImportantDate.objects.all()
+    tombstone_fields = ("date", "title")
+
+
+important_dates_sync = ImportantDatesSyncListView.as_view()
+
+
+class CoursePrerequisitesView(
+    PrerequisiteGraphMixin, ConditionalGetMixin, JSONResponseMixin, BaseDetailView
+):
+    """
+    The direct and transitive prerequisites of a course, and the courses
+    which (transitively) require it.
+    """
+
+    queryset = Course.objects.active().select_related("department")
+
+    def get_context_data(self, **kwargs):
+        graph = prereqgraph.get_graph()
+        course = self.object
+
+        def _courses(pk_list):
+            return [self.course_dict(graph.course(pk)) for pk in pk_list]
+
+        return {
+            "course": self.course_dict(course),
+            "prerequisites": [
+                {
+                    "requisite": "{}".format(prereq),
+                    "course": self.course_dict(prereq.requisite.course)
+                    if prereq.requisite.course_id is not None
+                    else None,
+                    "equiv_group": prereq.equiv_group,
+                    "minimum_grade": prereq.minimum_grade,
+                    "preferred": prereq.preferred,
+                    "corequisite": prereq.corequisite,
+                    "optional": prereq.optional,
+                }
+                for prereq in graph.prerequisites(course.pk)
+            ],
+            "prerequisite_chain": _courses(graph.prerequisite_chain(course.pk)),
+            "required_by": _courses(graph.required_by(course.pk)),
+        }
+
+
+course_prerequisites = CoursePrerequisitesView.as_view()
+
+
+class CoursePrerequisiteLevelsView(
+    PrerequisiteGraphMixin, ConditionalGetMixin, JSONResponseMixin, View
+):
+    """
+    Every course with prerequisites (or which is one), with its
+    topological level.
+    """
+
+    def get(self, request, *args, **kwargs):
+        graph = prereqgraph.get_graph()
+        data = [
+            dict(self.course_dict(graph.course(pk)), level=level)
+            for pk, level in graph.levels().items()
+        ]
+        data.sort(key=lambda d: (d["level"], d["label"]))
+        return self.render_to_response(data)
+
+
+course_prerequisite_levels = CoursePrerequisiteLevelsView.as_view()
+
+#################################################################
+
+
+class CourseListView(StreamingJSONListView):
+    queryset = Course.objects.filter(department__public=True)
+
+
+courses = CourseListView.as_view()
+
+
+class SemesterListView(StreamingJSONListView):
+    queryset = Semester.objects.all()
+
+
+semesters = SemesterListView.as_view()
+
+
+class SectionListView(StreamingJSONListView):
+    queryset = Section.objects.filter(course__department__public=True)
+    tombstone_fields = ("term__slug", "course__slug", "section_name")
+
+
+sections = SectionListView.as_view()
+
+
+class SectionScheduleListView(StreamingJSONListView):
+    queryset = SectionSchedule.objects.filter(section__course__department__public=True)
+    # the natural key of the section, with the key load_classes
+    #   matches schedules on.
+    tombstone_fields = (
+        "section__term__slug",
+        "section__course__slug",
+        "section__section_name",
+        "type__name",
+        "date_range__start",
+        "date_range__finish",
+        "timeslot__day",
+        "timeslot__start_time",
+        "timeslot__stop_time",
+    )
+
+
+schedules = SectionScheduleListView.as_view()
+
+
+class EnrollmentListView(StreamingJSONListView):
+    queryset = Enrollment.objects.filter(section__course__department__public=True)
+
+
+enrollment = EnrollmentListView.as_view()
+
 #################################################################
 #################################################################
 #################################################################
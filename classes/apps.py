@@ -19,6 +19,7 @@ class ClassesConfig(AppConfig):
         Any app specific startup code, e.g., register signals,
         should go here.
         """
+        from . import signals  # noqa: F401
 
 
 #########################################################################
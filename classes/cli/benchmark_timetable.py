@@ -0,0 +1,121 @@
+"""
+Count the queries (and time) needed to build the printable timetable
+of a semester.
+The single load timetable is compared with the way it used to be built:
+following the schedules lazily (no ``select_related()``), with separate
+instructor queries and a section count query for every timetable entry.
+"""
+################################################################
+from __future__ import print_function, unicode_literals
+
+import time
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ..models import SectionSchedule, Semester
+from ..utils import print_timetable
+from ..utils.abbreviations import abbreviation_map
+
+################################################################
+
+DJANGO_COMMAND = "main"
+USE_ARGPARSE = True
+OPTION_LIST = (
+    (
+        ["--fixture"],
+        dict(
+            action="append",
+            default=[],
+            help="Load this fixture first (rolled back afterwards); may be repeated",
+        ),
+    ),
+    (
+        ["term"],
+        dict(help="The semester to build the timetable for, by slug (e.g., fall-2013)"),
+    ),
+)
+HELP_TEXT = __doc__.strip()
+
+################################################################
+
+
+class _QuerySectionCounts(object):
+    """
+    Stands in for ``print_timetable.section_count_map()``: the number of
+    sections of a course is queried for every timetable entry.
+    """
+
+    def __init__(self, schedule_qs):
+        self.schedule_qs = schedule_qs
+
+    def get(self, course_pk, default=None):
+        return len(
+            set(
+                self.schedule_qs.filter(section__course=course_pk).values_list(
+                    "section__section_name", flat=True
+                )
+            )
+        )
+
+
+def _lazy_timetable(semester, schedule_types):
+    schedule_qs = SectionSchedule.objects.active().filter(
+        section__term=semester,
+        section__course__department__advertised=True,
+        type__name__in=schedule_types,
+    )
+    t1 = print_timetable.preliminary_table(schedule_qs)
+    instr_pks = set(
+        schedule_qs.exclude(instructor__isnull=True).values_list(
+            "instructor_id", flat=True
+        )
+    )
+    instr_pks.update(
+        schedule_qs.exclude(additional_instructors__isnull=True).values_list(
+            "additional_instructors", flat=True
+        )
+    )
+    name_map = abbreviation_map(instr_pks)
+    t2 = print_timetable._initial_display_table(
+        t1, name_map, _QuerySectionCounts(schedule_qs)
+    )
+    return print_timetable._display_timetable(t2)
+
+
+def _measure(func):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.time()
+        result = func()
+        elapsed = time.time() - start
+    return result, len(queries), elapsed
+
+
+def main(options, args):
+    verbosity = int(options["verbosity"])
+    schedule_types = ["Lecture", "Tutorial", "Laboratory", "Session"]
+
+    with transaction.atomic():
+        for fixture in options["fixture"]:
+            call_command("loaddata", fixture, verbosity=verbosity)
+        semester = Semester.objects.get(slug=options["term"])
+
+        single, single_count, single_time = _measure(
+            lambda: print_timetable.timetable(semester, schedule_types=schedule_types)
+        )
+        lazy, lazy_count, lazy_time = _measure(
+            lambda: _lazy_timetable(semester, schedule_types)
+        )
+        assert single == lazy, "The timetables differ!"
+        transaction.set_rollback(True)
+
+    if verbosity > 0:
+        print("{0}: {1} timetable rows".format(semester, len(single)))
+    print("Single load: {0} queries, {1:.3f}s".format(single_count, single_time))
+    print(
+        "Lazy, per entry queries: {0} queries, {1:.3f}s".format(lazy_count, lazy_time)
+    )
+
+
+################################################################
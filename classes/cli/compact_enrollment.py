@@ -0,0 +1,101 @@
+"""
+Compact the enrollment history.
+Within each run of consecutive identical enrollment records for a
+section, only the first and the last record of the run are kept.
+"""
+################################################################
+from __future__ import print_function, unicode_literals
+
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import transaction
+
+from ..models import Enrollment, Section
+from ..utils import termcache
+
+################################################################
+
+DJANGO_COMMAND = "main"
+USE_ARGPARSE = True
+OPTION_LIST = (
+    (
+        ["--no-save"],
+        dict(action="store_true", help="Do not actually update the database."),
+    ),
+    (
+        ["--term"],
+        dict(
+            dest="term",
+            help="Only compact the given term, by slug (e.g., fall-2013)",
+        ),
+    ),
+)
+HELP_TEXT = __doc__.strip()
+
+DELETE_CHUNK_SIZE = 500
+
+################################################################
+
+
+def redundant_pk_list(queryset):
+    """
+    Return the list of enrollment pks which can be removed without
+    losing information: the interior records of every run of identical
+    numbers for a section.
+    """
+    fields = ("pk", "section_id") + Enrollment.SNAPSHOT_FIELDS
+    rows = queryset.order_by("section", "created", "pk").values_list(*fields).iterator()
+    pk_list = []
+    for section_id, section_rows in groupby(rows, key=itemgetter(1)):
+        for snapshot, run in groupby(section_rows, key=itemgetter(slice(2, None))):
+            run_pks = [row[0] for row in run]
+            pk_list.extend(run_pks[1:-1])
+    return pk_list
+
+
+################################################################
+
+
+def delete_enrollment(pk_list):
+    """
+    Delete the given enrollment records, a chunk at a time, without
+    sending signals (a per row ``post_delete`` would cost several queries
+    each); the sections of each chunk are refreshed in one update, and
+    their terms invalidated once at the end.
+    """
+    term_ids = set()
+    with transaction.atomic():
+        for i in range(0, len(pk_list), DELETE_CHUNK_SIZE):
+            chunk = Enrollment.objects.filter(pk__in=pk_list[i : i + DELETE_CHUNK_SIZE])
+            sections = Section.objects.filter(
+                pk__in=set(chunk.values_list("section_id", flat=True))
+            )
+            # nothing cascades from an enrollment record, and
+            #   latest_enrollment is recomputed right after.
+            chunk._raw_delete(chunk.db)
+            sections.refresh_latest_enrollment()
+            term_ids.update(sections.values_list("term_id", flat=True))
+    if term_ids:
+        termcache.invalidate(*term_ids)
+
+
+def main(options, args):
+    no_save = options["no_save"]
+    verbosity = int(options["verbosity"])
+
+    queryset = Enrollment.objects.all()
+    if options["term"]:
+        queryset = queryset.filter(section__term__slug=options["term"])
+
+    pk_list = redundant_pk_list(queryset)
+    if not no_save:
+        delete_enrollment(pk_list)
+
+    if no_save or verbosity > 0:
+        msg = "{0} redundant enrollment records".format(len(pk_list))
+        msg += " found (not saved)" if no_save else " removed"
+        print(msg)
+
+
+################################################################
@@ -1,23 +1,31 @@
 """
 Pull future important dates from another installation using the API.
+Given the "important-dates/sync/" api, only the dates changed since the
+last pull are fetched (and deactivated dates are deactivated here too).
 """
 #######################
 from __future__ import print_function, unicode_literals
 
 import json
-from pprint import pprint
+import os
+
+from django.utils import timezone
 
 from .. import conf
 from ..models import ImportantDate
+from ..utils import occurrences
 
 #######################
 
 try:
     # Python 3:
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
     from urllib.request import urlopen
 except ImportError:
     # Python 2:
+    from urllib import urlencode
     from urllib2 import urlopen
+    from urlparse import parse_qsl, urlsplit, urlunsplit
 
 DJANGO_COMMAND = "main"
 USE_ARGPARSE = True
@@ -29,38 +37,163 @@ OPTION_LIST = (
             help='Specify an API url, if not given, the config option "api:important_dates_src_url" will be used',
         ),
     ),
+    (
+        ["--state"],
+        dict(
+            help='Remember the sync position in this file; if not given, the config option "api:important_dates_sync_state" will be used',
+        ),
+    ),
+    (
+        ["--since"],
+        dict(help="Only pull dates modified since this (ISO 8601) time"),
+    ),
+    (
+        ["--full"],
+        dict(action="store_true", help="Ignore the remembered sync position"),
+    ),
 )
 HELP_TEXT = __doc__.strip()
 
+# (Other) installations do not share primary keys; dates are matched on these.
+NATURAL_KEY = ("date", "title")
+SKIP_FIELDS = ("id", "created", "modified")
+
+#######################
+
+
+def fetch_json(url):
+    text_b = urlopen(url).read()
+    return json.loads(text_b.decode("utf-8"))
+
+
+def with_query(url, **params):
+    """
+    Return ``url`` with the given query parameters set.
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in params]
+    query.extend((k, v) for k, v in params.items() if v is not None)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def read_state(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_state(path, state):
+    if not path:
+        return
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.rename(path + ".tmp", path)
+
 
-def load_important_date_from_dict(data, blacklist_fields=["id", "created", "modified"]):
+#######################
+
+
+def apply_important_dates(record_list, verbosity=1):
     """
-    The data dictionary is from a JSON dump of the ImportantDate fields.
+    Create, update or deactivate important dates from a list of api
+    records (and tombstones), in bulk.
+    Returns the number of dates changed.
     """
-    for f in blacklist_fields:  # don't use these
-        if f in data:
-            del data[f]
+    fields = [f for f in ImportantDate._meta.fields if f.name not in SKIP_FIELDS]
+    data_list = [
+        {f.name: f.to_python(record[f.name]) for f in fields if f.name in record}
+        for record in record_list
+    ]
+    existing = {}
+    for obj in ImportantDate.objects.filter(
+        date__in=set(data["date"] for data in data_list)
+    ):
+        existing[tuple(getattr(obj, name) for name in NATURAL_KEY)] = obj
 
-    obj, created = ImportantDate.objects.get_or_create(**data)
-    if created:
-        print(obj)
+    new_list = []
+    changed_map = {}
+    for data in data_list:
+        key = tuple(data[name] for name in NATURAL_KEY)
+        obj = existing.get(key)
+        if obj is None:
+            if data.get("active", True):  # else: a tombstone for a date not here.
+                obj = ImportantDate(**data)
+                existing[key] = obj
+                new_list.append(obj)
+            continue
+        changed = False
+        for name, value in data.items():
+            if getattr(obj, name) != value:
+                setattr(obj, name, value)
+                changed = True
+        if changed and obj.pk is not None:
+            changed_map[obj.pk] = obj
+    changed_list = list(changed_map.values())
+
+    if new_list:
+        ImportantDate.objects.bulk_create(new_list)
+    if changed_list:
+        now = timezone.now()
+        for obj in changed_list:
+            obj.modified = now
+        ImportantDate.objects.bulk_update(
+            changed_list, [f.name for f in fields] + ["modified"]
+        )
+    if new_list or changed_list:
+        # bulk operations send no signals.
+        occurrences.invalidate()
+    if verbosity > 0:
+        for obj in new_list:
+            print(obj)
+        for obj in changed_list:
+            print("{}{}".format(obj, "" if obj.active else " [deactivated]"))
+    return len(new_list) + len(changed_list)
+
+
+def pull_changes(data, since=None, after=None, verbosity=1):
+    """
+    Apply the first page of changes from the sync api, ``data``, and
+    follow the rest of the pages.
+    Returns the new position, ``(modified_since, after)``.
+    """
+    while True:
+        apply_important_dates(data["results"], verbosity)
+        if data["results"]:
+            last = data["results"][-1]
+            since, after = last["modified"], last["id"]
+        if not data["next"]:
+            return since, after
+        data = fetch_json(data["next"])
 
 
 def main(options, args):
+    verbosity = int(options["verbosity"])
 
     if "api_url" in options and options["api_url"]:
         api_url = options["api_url"]
     else:
         api_url = conf.get("api:important_dates_src_url")
+    state_path = options["state"] or conf.get("api:important_dates_sync_state")
 
-    if api_url:
-        text_b = urlopen(api_url).read()
-        text = text_b.decode("utf-8")
-        data = json.loads(text)
-        for record in data:
-            load_important_date_from_dict(record)
-    else:
+    if not api_url:
         print(
             "[!!!]",
             'No API url is set.  Either set "api:important_dates_src_url" in the config dictionary or give --api-url',
         )
+        return
+
+    state = read_state(state_path)
+    since, after = None, None
+    if options["since"]:
+        since = options["since"]
+    elif not options["full"] and api_url in state:
+        since, after = state[api_url]
+
+    data = fetch_json(with_query(api_url, modified_since=since, after=after))
+    if isinstance(data, list):
+        # a plain list api (e.g., "important-dates/future/"): everything.
+        apply_important_dates(data, verbosity)
+        return
+    state[api_url] = pull_changes(data, since, after, verbosity)
+    write_state(state_path, state)
@@ -0,0 +1,38 @@
+"""
+Render the prerequisite maps of all advertised courses into the cache,
+so course pages do not need to run graphviz.
+"""
+################################################################
+from __future__ import print_function, unicode_literals
+
+from ..models import Course
+from ..views import course_graphviz_svg_data
+
+################################################################
+
+DJANGO_COMMAND = "main"
+USE_ARGPARSE = True
+OPTION_LIST = (
+    (["--dept"], dict(dest="dept", help="Only this department, by code (e.g., stat)")),
+)
+HELP_TEXT = __doc__.strip()
+
+################################################################
+
+
+def main(options, args):
+    verbosity = int(options["verbosity"])
+    qs = Course.objects.advertised().select_related("department")
+    if options["dept"]:
+        qs = qs.filter(department__code__iexact=options["dept"])
+    count = 0
+    for course in qs:
+        course_graphviz_svg_data(course)
+        count += 1
+        if verbosity > 1:
+            print("Rendered {0}".format(course.label))
+    if verbosity > 0:
+        print("Rendered {0} course maps.".format(count))
+
+
+################################################################
@@ -128,6 +128,8 @@ DEFAULT = {
     "course_outlines:upload_to": "handouts/%Y/%m",
     "course_outlines:storage": default_storage,
     "api:important_dates_src_url": None,  # if this is set, important dates will be pulled
+    # a file to remember how far important dates have been pulled (sync api only)
+    "api:important_dates_sync_state": None,
     "semester:advertisement_rules": {
         "in_advance_days": {  # how many days before the start to begin advertising.
             "1": 21,
@@ -167,6 +169,21 @@ DEFAULT = {
     "sectionhandout:title:plural": None,  # just add 's'
     "coursehandout:title": "material",
     "coursehandout:title:plural": None,
+    # seconds to keep expanded class dates in the cache
+    "occurrences:cache_timeout": 60 * 60 * 24,
+    # seconds to keep term scoped pages and data in the cache
+    #   (they are invalidated on change regardless)
+    "term_cache:timeout": 60 * 60 * 24,
+    # seconds to keep text linked by the course_autolink filter
+    #   (it is invalidated on Course or Department changes regardless)
+    "autolink:cache_timeout": 60 * 60 * 24,
+    # seconds to keep graphviz renderings (e.g., course prerequisite maps)
+    #   in the cache; they are keyed on their source, so never stale.
+    "graphviz:cache_timeout": 60 * 60 * 24 * 30,
+    # the number of rows in a page of the bulk json api, when no
+    #   ?limit= is given, and the largest ?limit= allowed.
+    "api:page_size": 1000,
+    "api:max_page_size": 10000,
 }
 
 ##############################################################
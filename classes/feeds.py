@@ -4,6 +4,7 @@ from __future__ import print_function, unicode_literals
 import datetime
 
 from classes.models import ImportantDate
+from classes.utils.conditional import conditional_on
 from django.contrib.syndication.views import Feed
 
 #######################
@@ -16,9 +17,17 @@ class ImportantDatesFeed(Feed):
     title_template = "feeds/important-dates_title.html"
     description_template = "feeds/important-dates_description.html"
 
-    def items(self):
+    def __call__(self, request, *args, **kwargs):
+        parent = super(ImportantDatesFeed, self).__call__
+        view = conditional_on(lambda *a, **kw: [self.item_queryset()])(parent)
+        return view(request, *args, **kwargs)
+
+    def item_queryset(self):
         threshold = datetime.date.today() + datetime.timedelta(days=7)
-        return ImportantDate.objects.before(threshold).order_by("-date")[:5]
+        return ImportantDate.objects.before(threshold)
+
+    def items(self):
+        return self.item_queryset().order_by("-date")[:5]
 
     def item_pubdate(self, item):
         # this return value needs to be a datetime-compatible field, i.e., a models.DateTimeField
@@ -13,6 +13,7 @@ from .querysets import (
     CourseHandoutQuerySet,
     CourseQuerySet,
     DepartmentQuerySet,
+    EnrollmentQuerySet,
     ImportantDateQuerySet,
     SectionHandoutQuerySet,
     SectionQuerySet,
@@ -280,26 +281,25 @@ class SemesterManager(CustomQuerySetManager):
 
         Does *not* create new objects.
         """
-        qs = self.filter(active=True)
-        year, term = self.get_current_raw_tuple()
+        from .utils import semesters
 
-        future_years = models.Q(year__gt=year)
+        year, term = self.get_current_raw_tuple()
 
         if term == "1":
-            this_year = models.Q(year=year)
+            this_year = lambda s: True
         elif term == "2":
-            this_year = models.Q(year=year, term__startswith="2") | models.Q(
-                year=year, term="3"
-            )
+            this_year = lambda s: s.term.startswith("2") or s.term == "3"
         elif term == "3":
-            this_year = models.Q(year=year, term="3")
+            this_year = lambda s: s.term == "3"
         else:
             assert (
                 False
             ), "unknown term code from SemesterManager.get_current_raw_tuple()"
 
-        qs = qs.filter(this_year | future_years)
-        return qs
+        pk_list = semesters.get_registry().pk_list(
+            lambda s: s.active and (s.year > year or (s.year == year and this_year(s)))
+        )
+        return self.filter(pk__in=pk_list)
 
     def get_next_qs(self):
         """
@@ -326,25 +326,21 @@ class SemesterManager(CustomQuerySetManager):
         Returns a semester object corresponding to the given date.
         This object is created if it doesn't yet exist.
         """
-        term = str((date.month - 1) // 4 + 1)
-        year = date.year
-        object, created_flag = self.get_or_create(year=year, term=term)
-        return object
+        from .utils import semesters
+
+        return semesters.get_registry().get_by_date(date)
 
     def filter_by_date_range(self, start, end):
         if not start < end:
             raise ValueError("start must be less than end")
-        start_term = str((start.month - 1) // 4 + 1)
-        end_term = str((end.month - 1) // 4 + 1)
-        if start.year == end.year:
-            return self.filter(
-                year=start.year, term__gte=start_term, term__lte=end_term
-            )
-        else:
-            start_year_Q = models.Q(year=start.year, term__gte=start_term)
-            end_year_Q = models.Q(year=end.year, term__lte=end_term)
-            middle_years_Q = models.Q(year__gt=start.year, year__lt=end.year)
-            return self.filter(start_year_Q | middle_years_Q | end_year_Q)
+        from .utils import semesters
+
+        start_key = (start.year, semesters.term_for_date(start))
+        end_key = (end.year, semesters.term_for_date(end))
+        pk_list = semesters.get_registry().pk_list(
+            lambda s: start_key <= (s.year, s.term) <= end_key
+        )
+        return self.filter(pk__in=pk_list)
 
     def get_by_pair(self, year, term_name):
         """
@@ -359,7 +355,9 @@ class SemesterManager(CustomQuerySetManager):
         if not term:
             raise ValueError("Could not find an associated term for %r" % term_name)
 
-        object, created_flag = self.get_or_create(year=year, term=term)
+        from .utils import semesters
+
+        object, created_flag = semesters.get_registry().get_or_create(year, term)
         return object
 
     def get_by_name(self, name):
@@ -547,6 +545,20 @@ ImportantDateManager = ImportantDateManager.from_queryset(ImportantDateQuerySet)
 #######################################################################
 
 
+class EnrollmentManager(CustomQuerySetManager):
+    """
+    Manager class for Enrollment objects.
+    Proxy to EnrollmentQuerySet.
+    """
+
+    queryset_class = EnrollmentQuerySet
+
+
+EnrollmentManager = EnrollmentManager.from_queryset(EnrollmentQuerySet)
+
+#######################################################################
+
+
 class DepartmentManager(CustomQuerySetManager):
     """
     Manager class for Department objects.
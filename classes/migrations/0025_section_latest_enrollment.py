@@ -0,0 +1,34 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_latest_enrollment(apps, schema_editor):
+    Enrollment = apps.get_model("classes", "Enrollment")
+    Section = apps.get_model("classes", "Section")
+    latest = (
+        Enrollment.objects.filter(section=models.OuterRef("pk"))
+        .order_by("-created", "-pk")
+        .values("pk")[:1]
+    )
+    Section.objects.update(latest_enrollment=models.Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("classes", "0024_auto_20190508_1102")]
+
+    operations = [
+        migrations.AddField(
+            model_name="section",
+            name="latest_enrollment",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="classes.Enrollment",
+            ),
+        ),
+        migrations.RunPython(populate_latest_enrollment, migrations.RunPython.noop),
+    ]
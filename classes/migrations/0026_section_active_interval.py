@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+def populate_active_interval(apps, schema_editor):
+    SectionSchedule = apps.get_model("classes", "SectionSchedule")
+    Section = apps.get_model("classes", "Section")
+    schedules = (
+        SectionSchedule.objects.filter(
+            section=models.OuterRef("pk"), active=True, date_range__isnull=False
+        )
+        .order_by()
+        .values("section")
+    )
+    Section.objects.update(
+        active_start=models.Subquery(
+            schedules.annotate(value=models.Min("date_range__start")).values("value")
+        ),
+        active_finish=models.Subquery(
+            schedules.annotate(value=models.Max("date_range__finish")).values("value")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("classes", "0025_section_latest_enrollment")]
+
+    operations = [
+        migrations.AddField(
+            model_name="section",
+            name="active_start",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="section",
+            name="active_finish",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="section",
+            index=models.Index(
+                fields=["active_start", "active_finish"],
+                name="classes_sec_active__6bdf57_idx",
+            ),
+        ),
+        migrations.RunPython(populate_active_interval, migrations.RunPython.noop),
+    ]
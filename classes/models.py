@@ -27,6 +27,7 @@ from .managers import (
     CourseHandoutManager,
     CourseManager,
     DepartmentManager,
+    EnrollmentManager,
     ImportantDateManager,
     SectionHandoutManager,
     SectionManager,
@@ -36,6 +37,7 @@ from .managers import (
     TimeslotManager,
 )
 from .querysets import PrerequisiteQuerySet, RequisiteQuerySet
+from .utils import occurrences, prereqgraph, semesters, termcache
 
 #################################################################
 #################################################################
@@ -271,25 +273,20 @@ class Course(ClassesBaseModel):
         return self.department.code + "\u00a0" + self.code
 
     @property
-    def reverse_prerequisites(self):
+    def active_prerequisites(self):
         """
-        Return a queryset that this course is a prerequsite for.
+        Return the list of active prerequisites for this course
+        (from the prerequisite graph).
         """
+        return prereqgraph.get_graph().prerequisites(self.pk)
 
-        def _get_prereq(c):
-            try:
-                return c.prerequisite_set.active().get(requisite__course_id=self.pk)
-            except (Prerequisite.DoesNotExist, Prerequisite.MultipleObjectsReturned):
-                return None
-
-        course_qs = Course.objects.filter(
-            active=True,
-            department__active=True,
-            prerequisite__active=True,
-            prerequisite__requisite__active=True,
-            prerequisite__requisite__course_id=self.pk,
-        )
-        return [(c, _get_prereq(c)) for c in course_qs]
+    @property
+    def reverse_prerequisites(self):
+        """
+        Return the (course, prerequisite) pairs of the courses
+        this course is a prerequsite for.
+        """
+        return prereqgraph.get_graph().reverse_prerequisites(self.pk)
 
     @property
     def map_svg_data(self):
@@ -505,13 +502,23 @@ class Semester(ClassesBaseModel):
         termlabel = dict(TERMS).get(termcode, termcode)
         slug = slugify("{} {}".format(termlabel, year))
         defaults = {"slug": slug, "active": True}
-        semester, created_flag = Semester.objects.get_or_create(
-            year=year, term="{}".format(term), defaults=defaults
+        semester, created_flag = semesters.get_registry().get_or_create(
+            year, "{}".format(term), defaults=defaults
         )
         if created_flag and load_new_dates:
             utils.load_dates(year)
         return semester
 
+    @property
+    def cache_generation(self):
+        """
+        The token for cached data of this term; it changes whenever
+        anything displayed for the term (its sections, schedules,
+        enrollments, handouts, courses, rooms, instructors...) changes.
+        Use as part of ``{% cache %}`` keys.
+        """
+        return termcache.generation(self.pk)
+
     @property
     def course_list(self):
         """
@@ -613,12 +620,32 @@ class Section(ClassesBaseModel):
         on_delete=models.PROTECT,
         limit_choices_to={"active": True, "advertised": True},
     )
+    # Denormalized; maintained by signals and
+    #   SectionQuerySet.refresh_latest_enrollment()
+    latest_enrollment = models.ForeignKey(
+        "Enrollment",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    # Denormalized: the earliest start and latest finish of the active
+    #   schedules.  Maintained by signals and
+    #   SectionQuerySet.refresh_active_interval()
+    active_start = models.DateField(null=True, blank=True, editable=False)
+    active_finish = models.DateField(null=True, blank=True, editable=False)
+
+    # Maintained with updates by the signals; an ordinary save of an
+    #   instance loaded earlier must not write its (old) values back.
+    DERIVED_FIELDS = ("latest_enrollment", "active_start", "active_finish")
 
     objects = SectionManager()
 
     class Meta:
         ordering = ["term", "course", "section_name"]
         base_manager_name = "objects"
+        indexes = [models.Index(fields=["active_start", "active_finish"])]
 
     def __str__(self):
         result = "{} {}".format(self.course.label, self.section_name)
@@ -630,10 +657,32 @@ class Section(ClassesBaseModel):
         return reverse("classes-section-detail", kwargs={"slug": self.slug})
 
     def save(self, *args, **kwargs):
+        self.update_section_type()
+        if (
+            not self._state.adding
+            and not args
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.DERIVED_FIELDS
+            ]
+        return super(Section, self).save(*args, **kwargs)
+
+    def update_section_type(self):
+        """
+        Set the section type according to the ``section_type:on_save``
+        setting.  (This is done by ``save()``; call it directly when
+        bypassing ``save()``, e.g., for ``bulk_create()``.)
+        Returns True if the section type changed.
+        """
         st = conf.get("section_type:on_save")(self)
-        if st is not None:
+        if st is not None and st != self.section_type:
             self.section_type = st
-        return super(Section, self).save(*args, **kwargs)
+            return True
+        return False
 
     def get_instructor(self):
         """
@@ -650,44 +699,35 @@ class Section(ClassesBaseModel):
         """
         Returns the most recent actual registration, if any
         """
-        try:
-            return self.enrollment_set.latest().registration
-        except Enrollment.DoesNotExist:
-            pass
+        if self.latest_enrollment is not None:
+            return self.latest_enrollment.registration
 
     def capacity(self):
         """
         Returns the most recent capacity, if any
         """
-        try:
-            return self.enrollment_set.latest().capacity
-        except Enrollment.DoesNotExist:
-            pass
+        if self.latest_enrollment is not None:
+            return self.latest_enrollment.capacity
 
     def waitlist_registration(self):
         """
         Returns the most recent actual registration, if any
         """
-        try:
-            return self.enrollment_set.latest().waitlist_registration
-        except Enrollment.DoesNotExist:
-            pass
+        if self.latest_enrollment is not None:
+            return self.latest_enrollment.waitlist_registration
 
     def waitlist_capacity(self):
         """
         Returns the most recent capacity, if any
         """
-        try:
-            return self.enrollment_set.latest().waitlist_capacity
-        except Enrollment.DoesNotExist:
-            pass
+        if self.latest_enrollment is not None:
+            return self.latest_enrollment.waitlist_capacity
 
     def get_enrollment_by_date(self, date=None):
+        if date is None:
+            return self.latest_enrollment
         try:
-            if date is None:
-                return self.enrollment_set.latest()
-            else:
-                return self.enrollment_set.filter(created__lte=date).latest()
+            return self.enrollment_set.filter(created__lte=date).latest()
         except Enrollment.DoesNotExist:
             pass
 
@@ -699,18 +739,17 @@ class Section(ClassesBaseModel):
 
     def is_current(self, reference_date=None, grace=21):
         """
-        Returns True if this section has any schedules
-        containing the given reference_date.
+        Returns True if the active interval of this section
+        contains the given reference_date.  Only active schedules count.
         If reference_date is None, then today is used.
         """
+        if self.active_start is None or self.active_finish is None:
+            return False
         if reference_date is None:
             reference_date = datetime.date.today()
         A = reference_date
         B = A - datetime.timedelta(days=grace)
-        qs = self.sectionschedule_set.filter(
-            date_range__start__lte=A, date_range__finish__gte=B
-        )
-        return qs.exists()
+        return self.active_start <= A and self.active_finish >= B
 
 
 #################################################################
@@ -735,6 +774,32 @@ class ScheduleType(ClassesBaseModel):
 #################################################################
 
 
+_section_event_relation_list = None
+
+
+def _section_event_relations():
+    """
+    Return ``(accessor, has_vevent, has_vevent_list)`` triples for the
+    reverse relations of Section (other than the schedules) whose models
+    can produce calendar events.
+    """
+    global _section_event_relation_list
+    if _section_event_relation_list is None:
+        result = []
+        for rel in Section._meta.related_objects:
+            if not (rel.one_to_many or rel.many_to_many):
+                continue
+            model = rel.related_model
+            if model is SectionSchedule:
+                continue
+            has_vevent = hasattr(model, "vevent")
+            has_vevent_list = hasattr(model, "vevent_list")
+            if has_vevent or has_vevent_list:
+                result.append((rel.get_accessor_name(), has_vevent, has_vevent_list))
+        _section_event_relation_list = result
+    return _section_event_relation_list
+
+
 @python_2_unicode_compatible
 class SectionSchedule(ClassesBaseModel):
     """
@@ -813,43 +878,15 @@ class SectionSchedule(ClassesBaseModel):
             if not self.date_range:
                 return []
 
-            term_dtstart = utils.blend_date_and_time(
-                self.date_range.start, self.timeslot.start_time
-            )
-            term_dtfinish = utils.blend_date_and_time(
-                self.date_range.finish, self.timeslot.start_time
-            )
-
-            rrs = dateutil.rrule.rruleset()
-            for impdate in ImportantDate.objects.filter(
-                active=True,
-                date__gte=self.date_range.start,
-                date__lte=self.date_range.finish,
-                no_class=True,
+            for date in occurrences.get_expander().class_dates(
+                self.timeslot, self.date_range
             ):
-                dt = utils.blend_date_and_time(impdate.date, self.timeslot.start_time)
-                rrs.exdate(dt)
-                if impdate.end_date is not None:
-                    enddt = utils.blend_date_and_time(
-                        impdate.end_date, datetime.time(hour=23, minute=59, second=59)
-                    )
-                    while dt <= enddt:
-                        dt += datetime.timedelta(days=1)
-                        rrs.exdate(dt)
-            term = dateutil.rrule.rrule(
-                dateutil.rrule.WEEKLY,  # count=26,
-                wkst=dateutil.rrule.SU,
-                byweekday=self.timeslot.get_rrule_days(),
-                dtstart=term_dtstart,
-            )
-            rrs.rrule(term)
-
-            for dtstart in rrs.between(term_dtstart, term_dtfinish, inc=True):
+                dtstart = utils.blend_date_and_time(date, self.timeslot.start_time)
                 ev = cal.add("vevent")
                 ev.add("dtstamp").value = dtstart
                 ev.add("dtstart").value = dtstart
                 ev.add("dtend").value = utils.blend_date_and_time(
-                    datetime.date(*(dtstart.timetuple()[:3])), self.timeslot.stop_time
+                    date, self.timeslot.stop_time
                 )
                 if not for_print:
                     ev.add("location").value = "{}".format(self.room)
@@ -873,19 +910,14 @@ class SectionSchedule(ClassesBaseModel):
             if not include_section_events:
                 return []
             # add events of objects that relate to this object
-            related_sets = [
-                attr
-                for attr in dir(self.section)
-                if attr.endswith("_set") and attr != "sectionschedule_set"
-            ]
-            for attr in related_sets:
-                related = getattr(self.section, attr)
-                if hasattr(related.model, "vevent"):
+            for accessor, has_vevent, has_vevent_list in _section_event_relations():
+                related = getattr(self.section, accessor)
+                if has_vevent:
                     for subobj in related.all():
                         ev = subobj.vevent()
                         if ev is not None:
                             cal.add(ev)
-                if hasattr(related.model, "vevent_list"):
+                if has_vevent_list:
                     for subobj in related.all():
                         for ev in subobj.vevent_list():
                             cal.add(ev)
@@ -1176,12 +1208,30 @@ class Enrollment(ClassesBaseModel):
     waitlist_capacity = models.IntegerField(default=0)
     waitlist_registration = models.IntegerField(default=0)
 
+    # The fields which make up the enrollment numbers; if none of these
+    #   change, a new record carries no new information.
+    SNAPSHOT_FIELDS = (
+        "capacity",
+        "registration",
+        "waitlist_capacity",
+        "waitlist_registration",
+    )
+
+    objects = EnrollmentManager()
+
     class Meta:
         get_latest_by = "created"
 
     def __str__(self):
         return "{self.registration}".format(self=self)
 
+    def snapshot(self):
+        """
+        Returns the enrollment numbers as a tuple, in the order given
+        by ``SNAPSHOT_FIELDS``.
+        """
+        return tuple(getattr(self, f) for f in self.SNAPSHOT_FIELDS)
+
 
 #################################################################
 #################################################################
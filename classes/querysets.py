@@ -90,42 +90,38 @@ class SectionQuerySet(BaseCustomQuerySet):
 
     def current(self, reference_date=None, grace=0):
         """
-        Filters the queryset so that only sections with a section schedule
-        containing the given reference_date are returned.
+        Filters the queryset so that only sections whose active interval
+        (see ``Section.active_start``) contains the given reference_date
+        are returned.  Only active schedules count towards the interval.
         If reference_date is None, then today is used.
         """
         if reference_date is None:
             reference_date = datetime.date.today()
         A = reference_date
         B = A - datetime.timedelta(days=grace)
-        return self.filter(
-            sectionschedule__date_range__start__lte=A,
-            sectionschedule__date_range__finish__gte=B,
-        ).distinct()
+        return self.filter(active_start__lte=A, active_finish__gte=B)
 
     def current_or_future(self, reference_date=None):
         """
-        Filters the queryset so that only sections with a section schedule
-        containing the given reference_date are returned.
+        Filters the queryset so that only sections which have not
+        finished by the given reference_date are returned.
+        Only active schedules count.
         If reference_date is None, then today is used.
         """
         if reference_date is None:
             reference_date = datetime.date.today()
-        return self.filter(
-            sectionschedule__date_range__start__gte=reference_date
-        ).distinct()
+        return self.filter(active_finish__gte=reference_date)
 
     def historical(self, reference_date=None):
         """
-        Filters the queryset so that only sections with a section schedule
-        ending before the given reference_date are returned.
+        Filters the queryset so that only sections which started
+        before the given reference_date are returned.
+        Only active schedules count.
         If reference_date is None, then today is used.
         """
         if reference_date is None:
             reference_date = datetime.date.today()
-        return self.filter(
-            sectionschedule__date_range__start__lt=reference_date
-        ).distinct()
+        return self.filter(active_start__lt=reference_date)
 
     def advertised(self):
         """
@@ -168,6 +164,80 @@ class SectionQuerySet(BaseCustomQuerySet):
         term = Semester.objects.get_current()
         return self.filter(term=term)
 
+    def with_enrollment(self):
+        """
+        Fetch the latest enrollment record along with each section,
+        so ``registration()``, ``capacity()``, etc. need no extra queries.
+        """
+        return self.select_related("latest_enrollment")
+
+    def with_enrollment_as_of(self, date=None):
+        """
+        Annotate each section with the enrollment numbers in effect
+        at ``date`` (default: the latest), as ``asof_capacity``,
+        ``asof_registration``, ``asof_waitlist_capacity`` and
+        ``asof_waitlist_registration``.
+        Sections without enrollment records at that time get ``None``.
+        All sections are resolved in the one query.
+        """
+        from .models import Enrollment
+
+        asof = Enrollment.objects.filter(section=models.OuterRef("pk"))
+        if date is not None:
+            asof = asof.filter(created__lte=date)
+        asof = asof.order_by("-created", "-pk")
+        return self.annotate(
+            **{
+                "asof_" + name: models.Subquery(asof.values(name)[:1])
+                for name in Enrollment.SNAPSHOT_FIELDS
+            }
+        )
+
+    def refresh_latest_enrollment(self):
+        """
+        Recompute the ``latest_enrollment`` of every section in this
+        QuerySet, in a single update.
+        This is needed after ``Enrollment.objects.bulk_create()``,
+        which does not send signals.
+        """
+        from .models import Enrollment
+
+        latest = (
+            Enrollment.objects.filter(section=models.OuterRef("pk"))
+            .order_by("-created", "-pk")
+            .values("pk")[:1]
+        )
+        return self.update(latest_enrollment=models.Subquery(latest))
+
+    def refresh_active_interval(self):
+        """
+        Recompute ``active_start`` and ``active_finish`` of every section
+        in this QuerySet, in a single update.
+        This is needed after bulk changes to schedules, which do not
+        send signals.
+        """
+        from .models import SectionSchedule
+
+        schedules = (
+            SectionSchedule.objects.filter(
+                section=models.OuterRef("pk"), active=True, date_range__isnull=False
+            )
+            .order_by()
+            .values("section")
+        )
+        return self.update(
+            active_start=models.Subquery(
+                schedules.annotate(value=models.Min("date_range__start")).values(
+                    "value"
+                )
+            ),
+            active_finish=models.Subquery(
+                schedules.annotate(value=models.Max("date_range__finish")).values(
+                    "value"
+                )
+            ),
+        )
+
     def sectionhandout_qs(self, active=True):
         from .models import SectionHandout
 
@@ -353,6 +423,40 @@ class SemesterQuerySet(BaseCustomQuerySet):
 #######################################################################
 
 
+class EnrollmentQuerySet(BaseCustomQuerySet):
+    """
+    Custom QuerySet for Enrollment objects.
+    """
+
+    def latest_per_section(self, date=None):
+        """
+        Restrict the QuerySet to the most recent enrollment record of
+        each section; or the most recent as of ``date``, if given.
+        This is a single query (a correlated subquery),
+        not one query per section.
+        """
+        latest = self.model.objects.filter(section=models.OuterRef("section"))
+        if date is not None:
+            latest = latest.filter(created__lte=date)
+        latest = latest.order_by("-created", "-pk").values("pk")[:1]
+        return self.filter(pk=models.Subquery(latest))
+
+    def snapshot_map(self):
+        """
+        Return a dictionary mapping section ids to the snapshot tuples
+        (see ``Enrollment.SNAPSHOT_FIELDS``) of the records in this
+        QuerySet.  Typically used after ``latest_per_section()``.
+        """
+        fields = self.model.SNAPSHOT_FIELDS
+        return {
+            values[0]: tuple(values[1:])
+            for values in self.values_list("section_id", *fields)
+        }
+
+
+#######################################################################
+
+
 class CourseHandoutQuerySet(BaseCustomQuerySet):
     """
     Custom QuerySet for CourseHandout objects.
@@ -0,0 +1,246 @@
+"""
+Signal handlers for the classes application.
+These are connected in ``ClassesConfig.ready()``.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from people.models import Person
+from places.models import ClassRoom
+
+from .models import (
+    Course,
+    Department,
+    Enrollment,
+    ImportantDate,
+    Prerequisite,
+    Requisite,
+    ScheduleType,
+    Section,
+    SectionHandout,
+    SectionSchedule,
+    Semester,
+    SemesterDateRange,
+    Timeslot,
+)
+from .utils import autolink, occurrences, prereqgraph, semesters, termcache
+
+#######################################################################
+
+
+def _on_commit(func, *args):
+    """
+    Call ``func(*args)`` when the current transaction commits (at once,
+    outside of a transaction).  Invalidating earlier would let another
+    request cache the uncommitted state under the new token, and a
+    rolled back change would still invalidate.
+    """
+    transaction.on_commit(lambda: func(*args))
+
+
+#######################################################################
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_saved(sender, instance, raw=False, **kwargs):
+    """
+    Keep ``Section.latest_enrollment`` pointing at the newest record.
+    """
+    if raw:
+        return
+    Section.objects.filter(pk=instance.section_id).refresh_latest_enrollment()
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    """
+    Deleting the latest record nulls the section's pointer
+    (``on_delete=SET_NULL``); find the next newest one.
+    Deleting any other record needs no work.
+    """
+    Section.objects.filter(
+        pk=instance.section_id, latest_enrollment__isnull=True
+    ).refresh_latest_enrollment()
+
+
+#######################################################################
+
+
+@receiver(post_save, sender=SectionSchedule)
+@receiver(post_delete, sender=SectionSchedule)
+def schedule_changed(sender, instance, raw=False, **kwargs):
+    """
+    Keep ``Section.active_start`` and ``active_finish`` current.
+    """
+    if raw:
+        return
+    Section.objects.filter(pk=instance.section_id).refresh_active_interval()
+
+
+@receiver(post_save, sender=SemesterDateRange)
+def date_range_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    Section.objects.filter(
+        sectionschedule__date_range=instance
+    ).refresh_active_interval()
+
+
+@receiver(pre_delete, sender=SemesterDateRange)
+def date_range_deleting(sender, instance, **kwargs):
+    """
+    Remember the sections with a schedule on the range; their schedules
+    will no longer point at it (``on_delete=SET_NULL``).
+    """
+    instance._section_ids = list(
+        Section.objects.filter(sectionschedule__date_range=instance)
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=SemesterDateRange)
+def date_range_deleted(sender, instance, **kwargs):
+    section_ids = getattr(instance, "_section_ids", [])
+    if section_ids:
+        Section.objects.filter(pk__in=section_ids).refresh_active_interval()
+
+
+#######################################################################
+
+
+@receiver(post_save, sender=ImportantDate)
+@receiver(post_delete, sender=ImportantDate)
+@receiver(post_save, sender=Timeslot)
+@receiver(post_delete, sender=Timeslot)
+@receiver(post_save, sender=SemesterDateRange)
+@receiver(post_delete, sender=SemesterDateRange)
+def occurrences_changed(sender, **kwargs):
+    """
+    Expanded class dates depend on these; discard them.
+    """
+    _on_commit(occurrences.invalidate)
+
+
+#######################################################################
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def catalogue_changed(sender, **kwargs):
+    """
+    Course labels and links depend on these; discard them.
+    """
+    _on_commit(autolink.invalidate)
+    _on_commit(prereqgraph.invalidate)
+
+
+@receiver(post_save, sender=Requisite)
+@receiver(post_delete, sender=Requisite)
+@receiver(post_save, sender=Prerequisite)
+@receiver(post_delete, sender=Prerequisite)
+def prerequisites_changed(sender, **kwargs):
+    _on_commit(prereqgraph.invalidate)
+
+
+#######################################################################
+
+
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def semester_changed(sender, instance, **kwargs):
+    _on_commit(semesters.invalidate)
+    _on_commit(termcache.invalidate, instance.pk)
+
+
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def section_changed(sender, instance, **kwargs):
+    _on_commit(termcache.invalidate, instance.term_id)
+
+
+@receiver(post_save, sender=SemesterDateRange)
+@receiver(post_delete, sender=SemesterDateRange)
+def date_range_changed(sender, instance, **kwargs):
+    _on_commit(termcache.invalidate, instance.semester_id)
+
+
+def _section_term_id(instance):
+    """
+    The term of ``instance.section``; from the loaded section if there
+    is one, else without loading it.
+    """
+    if instance._meta.get_field("section").is_cached(instance):
+        return instance.section.term_id
+    return (
+        Section.objects.filter(pk=instance.section_id)
+        .values_list("term_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=SectionSchedule)
+@receiver(post_delete, sender=SectionSchedule)
+@receiver(post_save, sender=SectionHandout)
+@receiver(post_delete, sender=SectionHandout)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def section_data_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    term_id = _section_term_id(instance)
+    if term_id is not None:
+        _on_commit(termcache.invalidate, term_id)
+
+
+@receiver(m2m_changed, sender=Section.additional_instructors.through)
+@receiver(m2m_changed, sender=SectionSchedule.additional_instructors.through)
+def additional_instructors_changed(sender, instance, action, reverse, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # a person's sections or schedules; in any term.
+        _on_commit(termcache.invalidate_all)
+    elif isinstance(instance, Section):
+        _on_commit(termcache.invalidate, instance.term_id)
+    else:
+        section_data_changed(sender, instance)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=ScheduleType)
+@receiver(post_delete, sender=ScheduleType)
+@receiver(post_save, sender=Timeslot)
+@receiver(post_delete, sender=Timeslot)
+@receiver(post_save, sender=ClassRoom)
+@receiver(post_delete, sender=ClassRoom)
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+@receiver(post_save, sender=Person.personkeyvalue_set.field.model)
+@receiver(post_delete, sender=Person.personkeyvalue_set.field.model)
+def shared_data_changed(sender, raw=False, **kwargs):
+    """
+    These are displayed in every term (the instructor initials in the
+    printed timetables come from the person key-values).
+    """
+    if raw:
+        return
+    _on_commit(termcache.invalidate_all)
+
+
+if apps.is_installed("exams"):
+    # the section pages list the exams of each section.
+    post_save.connect(section_data_changed, sender="exams.Exam")
+    post_delete.connect(section_data_changed, sender="exams.Exam")
+
+
+#######################################################################
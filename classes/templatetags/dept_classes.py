@@ -12,9 +12,10 @@ from __future__ import print_function, unicode_literals
 
 import re
 
-from classes.models import Course, Semester
+from classes import conf
+from classes.models import Semester
+from classes.utils import autolink
 from django import template
-from django.urls import reverse
 from django.utils.timezone import now
 
 #######################
@@ -36,17 +37,7 @@ def course_autolink(text):
 
     Usage: {{ string|courselink }}
     """
-    courses = Course.objects.advertised().select_related("department")
-    slug_map = dict([(course.label, course.slug) for course in courses])
-    result = text
-    for key in slug_map:
-        if key in text:
-            value = '<a href="%s">%s</a>' % (
-                reverse("classes-course-detail", args=[slug_map[key]]),
-                key,
-            )
-            result = result.replace(key, value)
-    return result
+    return autolink.get_linker().link(text)
 
 
 course_autolink.is_safe = True
@@ -72,11 +63,35 @@ def get_advertised_semesters(context, save_as=None, max_count=None):
 ################################################################
 
 
+@register.simple_tag
+def term_cache_timeout():
+    """
+    {% term_cache_timeout as timeout %}
+    {% cache timeout "fragment-name" term.pk term.cache_generation %}
+    """
+    return conf.get("term_cache:timeout")
+
+
+################################################################
+
+
 @register.filter
 def get_enrollment_by_date(section, date):
     return section.get_enrollment_by_date(date)
 
 
+@register.filter
+def advertised_sections_as_of(term, date):
+    """
+    {% for section in term|advertised_sections_as_of:date %}
+        {{ section.asof_registration }}
+    {% endfor %}
+
+    See ``SectionQuerySet.with_enrollment_as_of()``.
+    """
+    return term.section_set.advertised().with_enrollment_as_of(date)
+
+
 ################################################################
 
 
@@ -0,0 +1,153 @@
+"""
+Tests for the classes application.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import datetime
+import json
+
+from django.test import RequestFactory, TestCase
+from django.utils.text import slugify
+from people.models import Person
+
+from .api.views import SectionListView
+from .models import Course, Department, Section, Semester
+from .utils.abbreviations import abbreviation_map
+
+#######################
+
+
+class SectionTombstoneTest(TestCase):
+    def setUp(self):
+        department = Department.objects.create(
+            code="STAT", name="Statistics", slug="stat"
+        )
+        course = Course.objects.create(
+            department=department,
+            code="1000",
+            name="Basic Statistics",
+            slug="stat-1000",
+        )
+        semester = Semester.objects.create(year=2020, term="3", slug="fall-2020")
+        self.section = Section.objects.create(
+            course=course,
+            section_name="A01",
+            slug="stat-1000-a01-fall-2020",
+            crn="12345",
+            term=semester,
+            active=False,
+        )
+
+    def test_natural_key(self):
+        """
+        Another installation has other primary keys; a tombstone
+        must identify the section without them.
+        """
+        since = datetime.datetime(2000, 1, 1).isoformat()
+        request = RequestFactory().get("/", {"modified_since": since})
+        response = SectionListView.as_view()(request)
+        data = json.loads(b"".join(response.streaming_content).decode("utf-8"))
+        (tombstone,) = data["results"]
+        self.assertFalse(tombstone["active"])
+        lookups = {
+            name: value
+            for name, value in tombstone.items()
+            if name not in ("id", "active", "modified")
+        }
+        self.assertEqual(
+            lookups,
+            {
+                "term__slug": "fall-2020",
+                "course__slug": "stat-1000",
+                "section_name": "A01",
+            },
+        )
+        self.assertEqual(Section.objects.get(**lookups), self.section)
+
+
+#######################
+
+
+def _old_abbreviation_map(instr_pks):
+    """
+    The abbreviations as print_timetable used to compute them,
+    one ``lookup()`` per person.
+    """
+
+    def auto_abbreviate(name, n=1):
+        if name is None:
+            return ""
+        parts = name.split()
+        first_parts = "".join([p[0] for p in parts[:-1]])
+        last_part = parts[-1][:n]
+        return first_parts + last_part
+
+    name_map = {}
+    collision_map = {}
+    instr_map = {}
+    for instr in Person.objects.filter(pk__in=instr_pks).distinct():
+        instr_map[instr.pk] = instr
+        abbr = instr.personkeyvalue_set.lookup("initials")
+        if abbr is None:
+            abbr = auto_abbreviate(instr.cn, 1)
+        else:
+            abbr = abbr.value
+        name_map[instr.pk] = abbr
+
+    def _collision_check(name_map, collision_map):
+        value_list = list(name_map.values())
+        for key, value in name_map.items():
+            if value_list.count(value) == 1:
+                collision_map[key] = None
+            else:
+                collision_map[key] = [k for k, v in name_map.items() if v == value]
+
+    _collision_check(name_map, collision_map)
+    for key, value in collision_map.items():
+        if value is not None:
+            for pk in value:
+                name_map[pk] = auto_abbreviate(instr_map[pk].cn, 2)
+
+    _collision_check(name_map, collision_map)
+    key_done = []
+    for key, value in collision_map.items():
+        if key in key_done:
+            continue
+        if value is not None:
+            for count, pk in enumerate(value, 1):
+                name_map[pk] += "{}".format(count)
+                key_done.append(pk)
+    return name_map
+
+
+class AbbreviationTest(TestCase):
+    def _person(self, name):
+        defaults = Person.objects.guess_name_helper(name)
+        defaults["slug"] = slugify(defaults["cn"])
+        return Person.objects.create(**defaults)
+
+    def test_same_as_before(self):
+        """
+        Inactive and duplicate "initials" key-values are treated as the
+        people manager's ``lookup()`` treats them.
+        """
+        person_list = [
+            self._person(name)
+            for name in [
+                "John Smith",
+                "Jane Smith",
+                "Jill Smythe",
+                "Dave Gabrielson",
+                "Ann Other",
+                "Bob Twice",
+            ]
+        ]
+        person_list[3].personkeyvalue_set.create(key="initials", value="DG")
+        person_list[4].personkeyvalue_set.create(
+            key="initials", value="XX", active=False
+        )
+        person_list[5].personkeyvalue_set.create(key="initials", value="BT")
+        person_list[5].personkeyvalue_set.create(key="initials", value="RT")
+        pk_list = [p.pk for p in person_list]
+        self.assertEqual(abbreviation_map(pk_list), _old_abbreviation_map(pk_list))
@@ -7,11 +7,11 @@ from __future__ import print_function, unicode_literals
 #######################
 from django.conf.urls import include, url
 from django.views.generic import TemplateView
-from webcal import views as webcal_views
 
 from .. import views
 from ..feeds import ImportantDatesFeed
-from ..models import ImportantDate, Section, SectionHandout
+from ..models import SectionHandout
+from ..views import calendar as calendar_views
 
 urlpatterns = [
     url(
@@ -138,19 +138,19 @@ urlpatterns = [
     # CLASS CALENDARS:
     url(
         r"^calendar/important-dates$",
-        webcal_views.generic_queryset_icalendar,
-        kwargs={
-            "queryset": ImportantDate.objects.active(),
-            "include_set_events": False,
-        },
+        calendar_views.important_dates_calendar,
         name="classes-calendar-important-dates",
     ),
     url(
         r"^calendar/section/(?P<object_id>\d+)$",
-        webcal_views.generic_object_icalendar,
-        kwargs={"queryset": Section.objects.all(), "include_set_events": False},
+        calendar_views.section_calendar,
         name="classes-calendar-section",
     ),
+    url(
+        r"^calendar/term/(?P<slug>[\w-]+)$",
+        calendar_views.semester_calendar,
+        name="classes-calendar-term",
+    ),
     url(r"^calendar/instr/(?P<slug>[\w-]+)$", views.calendar_redirect),
     url(r"^calendar/instr/(?P<slug>[\w-]+)/$", views.calendar_redirect),
     url(r"^api/", include("classes.api.urls")),
@@ -0,0 +1,105 @@
+"""
+Short, unique name abbreviations for instructors (e.g., "DG"), for
+timetables and other compact listings.
+
+An instructor's "initials" key-value is used when there is one; otherwise
+the initials of the given names plus the first letter of the last name.
+Colliding abbreviations are resolved by using two letters of the last name,
+and then by numbering.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+from collections import OrderedDict
+
+from people.models import Person
+
+#######################
+
+INITIALS_KEY = "initials"
+
+#######################################################################
+
+
+def auto_abbreviate(name, n=1):
+    """
+    The initials of all but the last part of ``name``, followed by the
+    first ``n`` letters of the last part.
+    """
+    if name is None:
+        return ""
+    parts = name.split()
+    first_parts = "".join([p[0] for p in parts[:-1]])
+    last_part = parts[-1][:n]
+    return first_parts + last_part
+
+
+def collisions(name_map):
+    """
+    Return the lists of keys of ``name_map`` which share a value
+    (only those with more than one key).
+    """
+    groups = OrderedDict()
+    for key, value in name_map.items():
+        groups.setdefault(value, []).append(key)
+    return [key_list for key_list in groups.values() if len(key_list) > 1]
+
+
+def initials_map(person_list):
+    """
+    Map the pks of the given people to their "initials" key-value, for
+    those that have one.
+    One query finds the people with any "initials" key-value; the value
+    is then taken with the manager's ``lookup()`` (which knows about
+    inactive and duplicate key-values) only for those people.
+    """
+    related = Person.personkeyvalue_set
+    candidates = set(
+        related.field.model.objects.filter(
+            **{
+                related.field.name + "__in": [p.pk for p in person_list],
+                "key": INITIALS_KEY,
+            }
+        ).values_list(related.field.attname, flat=True)
+    )
+    result = {}
+    for person in person_list:
+        if person.pk not in candidates:
+            continue
+        keyvalue = person.personkeyvalue_set.lookup(INITIALS_KEY)
+        if keyvalue is not None:
+            result[person.pk] = keyvalue.value
+    return result
+
+
+def abbreviation_map(pk_list):
+    """
+    Map the pks of the given people to unique abbreviations.
+    """
+    person_list = list(Person.objects.filter(pk__in=pk_list).distinct())
+    initials = initials_map(person_list)
+    cn_map = {p.pk: p.cn for p in person_list}
+
+    name_map = OrderedDict()
+    for person in person_list:
+        abbr = initials.get(person.pk)
+        if abbr is None:
+            abbr = auto_abbreviate(person.cn, 1)
+        name_map[person.pk] = abbr
+
+    # first fix: auto_abbreviate(..., 2)
+    for key_list in collisions(name_map):
+        for pk in key_list:
+            name_map[pk] = auto_abbreviate(cn_map[pk], 2)
+
+    # second fix: numbers.
+    for key_list in collisions(name_map):
+        for count, pk in enumerate(key_list, 1):
+            name_map[pk] += "{}".format(count)
+
+    # final check: there should be no collisions here...
+    assert not collisions(name_map), "still have collisions"
+    return dict(name_map)
+
+
+#######################################################################
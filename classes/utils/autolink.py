@@ -0,0 +1,105 @@
+"""
+Linking of course labels (e.g., "STAT 1000") in text to the course pages.
+
+The labels of all advertised courses are compiled, once per version, into
+a single alternation regular expression (longest labels first), so text is
+linked in one pass.  Linked text is cached, keyed on
+``(version, digest of the text)``.  The version changes whenever a
+``Course`` or ``Department`` is saved or deleted (see ``classes.signals``).
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import hashlib
+import re
+import uuid
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from .. import conf
+
+#######################
+
+VERSION_KEY = "classes:autolink:version"
+
+_linker = None
+
+#######################################################################
+
+
+def current_version():
+    """
+    Return the current version token of the course catalogue.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """
+    Discard the compiled labels and all cached linked text.
+    """
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_linker():
+    """
+    Return a ``CourseLinker`` for the current version;
+    the same one is reused until the version changes.
+    """
+    global _linker
+    version = current_version()
+    if _linker is None or _linker.version != version:
+        _linker = CourseLinker(version)
+    return _linker
+
+
+#######################################################################
+
+
+class CourseLinker(object):
+    """
+    Link the labels of the advertised courses to their course pages.
+    """
+
+    def __init__(self, version=None):
+        from ..models import Course
+
+        if version is None:
+            version = current_version()
+        self.version = version
+        self.url_map = {}
+        for course in Course.objects.advertised().select_related("department"):
+            self.url_map[course.label] = reverse(
+                "classes-course-detail", args=[course.slug]
+            )
+        if self.url_map:
+            labels = sorted(self.url_map, key=len, reverse=True)
+            self.pattern = re.compile("|".join(re.escape(l) for l in labels))
+        else:
+            self.pattern = None
+
+    def _replace(self, match):
+        label = match.group(0)
+        return '<a href="%s">%s</a>' % (self.url_map[label], label)
+
+    def link(self, text):
+        """
+        Return ``text`` with every course label linked.
+        """
+        if self.pattern is None or not text:
+            return text
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        key = "classes:autolink:{0}:{1}".format(self.version, digest)
+        result = cache.get(key)
+        if result is None:
+            result = self.pattern.sub(self._replace, text)
+            cache.set(key, result, conf.get("autolink:cache_timeout"))
+        return result
+
+
+#######################################################################
@@ -0,0 +1,93 @@
+"""
+Conditional GET support (ETag / Last-Modified).
+
+A view lists the querysets it depends on; the validators are computed
+from a ``Max("modified")`` and ``Count("pk")`` aggregate over each of
+them, which is much cheaper than rendering the page.  The count catches
+deletions, and rows dropping out of a filtered queryset.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+#######################
+
+STATE_ATTRIBUTE = "_classes_conditional_state"
+
+#######################################################################
+
+
+def queryset_state(*querysets):
+    """
+    Return ``(last_modified, etag)`` for the given querysets.
+    ``last_modified`` is the most recent ``modified`` time (or ``None``).
+    """
+    last_modified = None
+    parts = []
+    for queryset in querysets:
+        result = queryset.order_by().aggregate(
+            latest=Max("modified"), count=Count("pk")
+        )
+        latest = result["latest"]
+        parts.append(
+            "{0}:{1}:{2}".format(
+                queryset.model._meta.label_lower,
+                result["count"],
+                latest.isoformat() if latest is not None else "",
+            )
+        )
+        if latest is not None and (last_modified is None or latest > last_modified):
+            last_modified = latest
+    etag = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return last_modified, etag
+
+
+def conditional_on(get_querysets):
+    """
+    Decorator for view functions.
+    ``get_querysets(request, *args, **kwargs)`` returns the list of
+    querysets the view depends on; the aggregates are run once per request.
+    """
+
+    def _state(request, *args, **kwargs):
+        state = getattr(request, STATE_ATTRIBUTE, None)
+        if state is None:
+            state = queryset_state(*get_querysets(request, *args, **kwargs))
+            setattr(request, STATE_ATTRIBUTE, state)
+        return state
+
+    def _etag(request, *args, **kwargs):
+        return _state(request, *args, **kwargs)[1]
+
+    def _last_modified(request, *args, **kwargs):
+        return _state(request, *args, **kwargs)[0]
+
+    return condition(etag_func=_etag, last_modified_func=_last_modified)
+
+
+#######################################################################
+
+
+class ConditionalGetMixin(object):
+    """
+    Mixin for class based views: answer ``If-None-Match`` and
+    ``If-Modified-Since`` with a 304 when nothing the view depends on
+    has changed.
+    Override ``get_dependent_querysets()``; the default is the view's
+    own queryset.
+    """
+
+    def get_dependent_querysets(self):
+        return [self.get_queryset()]
+
+    def dispatch(self, request, *args, **kwargs):
+        parent = super(ConditionalGetMixin, self).dispatch
+        decorator = conditional_on(lambda *a, **kw: self.get_dependent_querysets())
+        return decorator(parent)(request, *args, **kwargs)
+
+
+#######################################################################
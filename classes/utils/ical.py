@@ -0,0 +1,65 @@
+"""
+Streaming iCalendar output.
+
+Events are serialized one at a time as they are produced, so a calendar
+for a whole term never needs to be held in memory.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import datetime
+
+from django.utils.timezone import is_aware, utc
+
+#######################
+
+CRLF = "\r\n"
+PRODID = "-//dept-classes//classes//EN"
+DATETIME_PROPERTIES = ("dtstamp", "dtstart", "dtend")
+
+#######################################################################
+
+
+def object_vevents(obj, include_section_events=False):
+    """
+    Return the vevents for a single object, using either its
+    ``vevent_list()`` or ``vevent()`` method.
+    """
+    if hasattr(obj, "vevent_list"):
+        return obj.vevent_list(include_section_events=include_section_events)
+    if hasattr(obj, "vevent"):
+        ev = obj.vevent()
+        return [ev] if ev is not None else []
+    return []
+
+
+def to_utc(ev):
+    """
+    Convert the aware datetimes of ``ev`` to UTC, in place, so the
+    serialized event does not need a VTIMEZONE component.
+    """
+    for name in DATETIME_PROPERTIES:
+        for line in ev.contents.get(name, []):
+            value = line.value
+            if isinstance(value, datetime.datetime) and is_aware(value):
+                line.value = value.astimezone(utc)
+    return ev
+
+
+def iter_icalendar(object_list, get_events=object_vevents, name=None):
+    """
+    Generate the text of a VCALENDAR, in chunks, for the events of
+    every object in ``object_list``.
+    ``get_events(obj)`` returns the vevents for one object.
+    """
+    header = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:" + PRODID]
+    if name:
+        header.append("X-WR-CALNAME:" + name)
+    yield CRLF.join(header) + CRLF
+    for obj in object_list:
+        for ev in get_events(obj):
+            yield to_utc(ev).serialize()
+    yield "END:VCALENDAR" + CRLF
+
+
+#######################################################################
@@ -0,0 +1,140 @@
+"""
+Expansion of weekly section schedules into the dates of their classes.
+
+Expanding the recurrence rule and removing the ``no_class`` important
+dates is the same work for every schedule sharing a timeslot and a
+date range, so the results are cached, keyed on
+``(timeslot, date_range, version)``.  The version changes whenever an
+``ImportantDate``, ``Timeslot`` or ``SemesterDateRange`` is saved or
+deleted (see ``classes.signals``).
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import datetime
+import uuid
+
+import dateutil.rrule
+from django.core.cache import cache
+
+from .. import conf
+
+#######################
+
+VERSION_KEY = "classes:occurrences:version"
+
+_expander = None
+
+#######################################################################
+
+
+def current_version():
+    """
+    Return the current version token of the occurrence cache.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """
+    Discard all cached occurrences.
+    """
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_expander():
+    """
+    Return an ``OccurrenceExpander`` for the current version;
+    the same one is reused until the version changes.
+    """
+    global _expander
+    version = current_version()
+    if _expander is None or _expander.version != version:
+        _expander = OccurrenceExpander(version)
+    return _expander
+
+
+#######################################################################
+
+
+class OccurrenceExpander(object):
+    """
+    Compute, and remember, the class dates for timeslot/date range pairs.
+    The ``no_class`` important dates are loaded at most once.
+    """
+
+    def __init__(self, version=None):
+        if version is None:
+            version = current_version()
+        self.version = version
+        self._no_class_list = None
+        self._memo = {}
+
+    def no_class_list(self):
+        """
+        Return the ``(date, end_date)`` pairs of all active no class dates.
+        """
+        if self._no_class_list is None:
+            from ..models import ImportantDate
+
+            self._no_class_list = list(
+                ImportantDate.objects.filter(active=True, no_class=True).values_list(
+                    "date", "end_date"
+                )
+            )
+        return self._no_class_list
+
+    def excluded_dates(self, start, finish):
+        """
+        Return the set of dates with no classes, for important dates
+        beginning between ``start`` and ``finish``.
+        """
+        result = set()
+        for date, end_date in self.no_class_list():
+            if not (start <= date <= finish):
+                continue
+            result.add(date)
+            if end_date is not None:
+                # This matches the historical exdate loop, which also
+                #   excludes the day after ``end_date``.
+                while date <= end_date:
+                    date += datetime.timedelta(days=1)
+                    result.add(date)
+        return result
+
+    def class_dates(self, timeslot, date_range):
+        """
+        Return the list of dates on which ``timeslot`` meets during
+        ``date_range``.
+        """
+        key = "classes:occurrences:{0}:{1}:{2}".format(
+            self.version, timeslot.pk, date_range.pk
+        )
+        if key in self._memo:
+            return self._memo[key]
+        result = cache.get(key)
+        if result is None:
+            result = self._expand(timeslot, date_range)
+            cache.set(key, result, conf.get("occurrences:cache_timeout"))
+        self._memo[key] = result
+        return result
+
+    def _expand(self, timeslot, date_range):
+        start = date_range.start
+        finish = date_range.finish
+        rule = dateutil.rrule.rrule(
+            dateutil.rrule.WEEKLY,
+            wkst=dateutil.rrule.SU,
+            byweekday=timeslot.get_rrule_days(),
+            dtstart=datetime.datetime(start.year, start.month, start.day),
+            until=datetime.datetime(finish.year, finish.month, finish.day),
+        )
+        excluded = self.excluded_dates(start, finish)
+        return [dt.date() for dt in rule if dt.date() not in excluded]
+
+
+#######################################################################
@@ -0,0 +1,224 @@
+"""
+An in-memory graph of course prerequisites.
+
+Every active prerequisite is loaded (in two queries) into adjacency lists:
+forward edges from a course to its prerequisites (in their usual order,
+with their equivalence groups), and reverse edges from a course to the
+courses which require it.  Transitive prerequisite chains, reverse
+reachability and topological levels are computed from those lists.
+
+The graph is built once per version and shared; the version changes
+whenever a ``Course``, ``Department``, ``Requisite`` or ``Prerequisite``
+is saved or deleted (see ``classes.signals``).  The model instances in
+the graph are shared too, and must not be modified.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import uuid
+from collections import OrderedDict, deque
+
+from django.core.cache import cache
+
+#######################
+
+VERSION_KEY = "classes:prereqgraph:version"
+
+_graph = None
+
+#######################################################################
+
+
+def current_version():
+    """
+    Return the current version token of the prerequisite graph.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """
+    Discard the loaded graph (in every process).
+    """
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_graph():
+    """
+    Return a ``PrerequisiteGraph`` for the current version;
+    the same one is reused until the version changes.
+    """
+    global _graph
+    version = current_version()
+    if _graph is None or _graph.version != version:
+        _graph = PrerequisiteGraph(version)
+    return _graph
+
+
+#######################################################################
+
+
+class PrerequisiteGraph(object):
+    """
+    Course prerequisites, by course pk.
+    """
+
+    def __init__(self, version=None):
+        from ..models import Course, Prerequisite
+
+        if version is None:
+            version = current_version()
+        self.version = version
+
+        # the courses which can appear as requiring another course, in
+        #   their usual order.
+        self.courses = OrderedDict(
+            (course.pk, course)
+            for course in Course.objects.filter(
+                active=True, department__active=True
+            ).select_related("department")
+        )
+        self.forward = {}  # course pk -> [Prerequisite, ...]
+        self.reverse = {}  # requisite course pk -> [Prerequisite, ...]
+        self.requisite_courses = {}  # pk -> Course, for every local requisite
+        prereq_qs = Prerequisite.objects.active().select_related(
+            "requisite__course__department"
+        )
+        for prereq in prereq_qs:
+            self.forward.setdefault(prereq.course_id, []).append(prereq)
+            requisite_id = prereq.requisite.course_id
+            if requisite_id is None:
+                continue
+            self.requisite_courses[requisite_id] = prereq.requisite.course
+            if prereq.course_id in self.courses:
+                self.reverse.setdefault(requisite_id, []).append(prereq)
+        position = {pk: i for i, pk in enumerate(self.courses)}
+        for prereq_list in self.reverse.values():
+            prereq_list.sort(key=lambda p: position[p.course_id])
+
+    def course(self, course_pk):
+        """
+        The course with the given pk, if it is in the graph (else ``None``).
+        """
+        if course_pk in self.courses:
+            return self.courses[course_pk]
+        return self.requisite_courses.get(course_pk)
+
+    # adjacency ########################################################
+
+    def prerequisites(self, course_pk):
+        """
+        The active prerequisites of a course;
+        like ``course.prerequisite_set.active()``.
+        """
+        return self.forward.get(course_pk, [])
+
+    def equiv_groups(self, course_pk):
+        """
+        The active prerequisites of a course, as a list of
+        ``(equiv_group, [prerequisite, ...])`` pairs.
+        """
+        groups = OrderedDict()
+        for prereq in self.prerequisites(course_pk):
+            groups.setdefault(prereq.equiv_group, []).append(prereq)
+        return list(groups.items())
+
+    def reverse_prerequisites(self, course_pk):
+        """
+        The ``(course, prerequisite)`` pairs of the active courses which
+        require the given course.
+        """
+        return [
+            (self.courses[prereq.course_id], prereq)
+            for prereq in self.reverse.get(course_pk, [])
+        ]
+
+    def is_connected(self, course_pk):
+        """
+        Does the course have any prerequisites, or is it one?
+        """
+        return course_pk in self.forward or course_pk in self.reverse
+
+    # reachability #####################################################
+
+    def _requisite_pks(self, course_pk):
+        for prereq in self.prerequisites(course_pk):
+            if prereq.requisite.course_id is not None:
+                yield prereq.requisite.course_id
+
+    def _dependent_pks(self, course_pk):
+        for prereq in self.reverse.get(course_pk, []):
+            yield prereq.course_id
+
+    def _reachable(self, course_pk, neighbours):
+        seen = set([course_pk])
+        result = []
+        queue = deque([course_pk])
+        while queue:
+            for pk in neighbours(queue.popleft()):
+                if pk not in seen:
+                    seen.add(pk)
+                    result.append(pk)
+                    queue.append(pk)
+        return result
+
+    def prerequisite_chain(self, course_pk):
+        """
+        The pks of every course which is (directly, or through other
+        courses) a prerequisite of the given course; nearest first.
+        """
+        return self._reachable(course_pk, self._requisite_pks)
+
+    def required_by(self, course_pk):
+        """
+        The pks of every course which (directly, or through other
+        courses) requires the given course; nearest first.
+        """
+        return self._reachable(course_pk, self._dependent_pks)
+
+    def levels(self):
+        """
+        Map course pks to topological levels: courses without local
+        prerequisites are level 0; every other course is one level past
+        its highest prerequisite.  Corequisite edges are ignored, and
+        courses in a prerequisite cycle are left out.
+        Only the active courses of active departments are levelled
+        (a prerequisite chain stops at any other course).
+        """
+        requisites = {}
+        for course_pk in self.forward:
+            if course_pk not in self.courses:
+                continue
+            requisites[course_pk] = set(
+                prereq.requisite.course_id
+                for prereq in self.forward[course_pk]
+                if prereq.requisite.course_id in self.courses
+                and not prereq.corequisite
+                and prereq.requisite.course_id != course_pk
+            )
+        pending = {pk: len(pk_set) for pk, pk_set in requisites.items()}
+        dependents = {}
+        for course_pk, pk_set in requisites.items():
+            for pk in pk_set:
+                pending.setdefault(pk, 0)
+                dependents.setdefault(pk, []).append(course_pk)
+
+        result = {}
+        queue = deque(pk for pk, count in pending.items() if count == 0)
+        for pk in queue:
+            result[pk] = 0
+        while queue:
+            pk = queue.popleft()
+            for dependent in dependents.get(pk, []):
+                result[dependent] = max(result.get(dependent, 0), result[pk] + 1)
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    queue.append(dependent)
+        return {pk: level for pk, level in result.items() if pending[pk] == 0}
+
+
+#######################################################################
@@ -10,7 +10,8 @@ from itertools import chain, groupby
 
 from classes.models import SectionSchedule, Semester
 from django.template.loader import render_to_string
-from people.models import Person
+
+from .abbreviations import abbreviation_map
 
 #######################
 
@@ -36,98 +37,61 @@ def preliminary_table(schedule_list):
 ###############################################################
 
 
-def _instructor_abbrev_map(schedule_list):
-    # map instructors to name abbreviations
+def schedule_queryset(semester, schedule_types):
+    """
+    The advertised section schedules of the given types for a semester,
+    with everything the timetable displays loaded in the same query.
+    """
+    return (
+        SectionSchedule.objects.active()
+        .filter(
+            section__term=semester,
+            section__course__department__advertised=True,
+            type__name__in=schedule_types,
+        )
+        .select_related("timeslot", "type", "section__course__department")
+    )
 
-    def auto_abbreviate(name, n=1):
-        if name is None:
-            return ""
-        parts = name.split()
-        first_parts = "".join([p[0] for p in parts[:-1]])
-        last_part = parts[-1][:n]
-        return first_parts + last_part
 
+def instructor_pk_set(schedule_list, schedule_qs):
+    """
+    The pks of every instructor (including additional instructors)
+    of the loaded ``schedule_list``, the result of ``schedule_qs``.
+    """
     instr_pks = set(
-        schedule_list.exclude(instructor__isnull=True).values_list(
-            "instructor_id", flat=True
-        )
+        sched.instructor_id
+        for sched in schedule_list
+        if sched.instructor_id is not None
     )
     instr_pks.update(
-        schedule_list.exclude(additional_instructors__isnull=True).values_list(
+        schedule_qs.exclude(additional_instructors__isnull=True).values_list(
             "additional_instructors", flat=True
         )
     )
-    instructor_qs = Person.objects.filter(pk__in=instr_pks).distinct()
-
-    name_map = {}
-    collision_map = {}
-    instr_map = {}
-    for instr in instructor_qs:
-        instr_map[instr.pk] = instr
-        abbr = instr.personkeyvalue_set.lookup("initials")
-        if abbr is None:
-            abbr = auto_abbreviate(instr.cn, 1)
-            collision_map[instr.pk] = True
-        else:
-            abbr = abbr.value
-            collision_map[instr.pk] = None
-        name_map[instr.pk] = abbr
-
-    # collision check...
-    def _collision_check(name_map, collision_map):
-        value_list = list(name_map.values())
-        for key, value in name_map.items():
-            count = value_list.count(value)
-            if count == 1:
-                collision_map[key] = None
-            else:
-                collision_map[key] = [k for k, v in name_map.items() if v == value]
-
-    _collision_check(name_map, collision_map)
-
-    # first fix: auto_abbreviate(..., 2)
-    for key, value in collision_map.items():
-        if value is not None:
-            for pk in value:
-                instr = instr_map[pk]
-                name_map[pk] = auto_abbreviate(instr.cn, 2)
-
-    _collision_check(name_map, collision_map)
-
-    # second fix: numbers.
-    key_done = []
-    for key, value in collision_map.items():
-        if key in key_done:
-            continue
-        if value is not None:
-            n = 1
-            for count, pk in enumerate(value, 1):
-                name_map[pk] += "{}".format(count)
-                key_done.append(pk)
+    return instr_pks
 
-    # final check: there should be no collisions here...
-    _collision_check(name_map, collision_map)
-    assert not any([v for k, v in collision_map.items()]), "still have collisions"
-    return name_map
+
+def section_count_map(schedule_list):
+    """
+    Map course pks to the number of distinct sections of that course
+    in ``schedule_list``.
+    """
+    section_names = {}
+    for sched in schedule_list:
+        section_names.setdefault(sched.section.course_id, set()).add(
+            sched.section.section_name
+        )
+    return {pk: len(names) for pk, names in section_names.items()}
 
 
 ###############################################################
 
 
-def _format_multisection(schedule, name_map, schedule_list):
+def _format_multisection(schedule, name_map, section_counts):
     result = schedule.section.course.code
     if schedule.type.name not in ["Lecture", "Class"]:
         result += " " + schedule.type.name[:3]
-    if (
-        len(
-            set(
-                schedule_list.filter(
-                    section__course=schedule.section.course
-                ).values_list("section__section_name", flat=True)
-            )
-        )
-        > 1
-    ):
+    if section_counts.get(schedule.section.course_id, 0) > 1:
         result += " " + schedule.section.section_name
     abbrev = name_map.get(schedule.instructor_id, None)
     if abbrev:
@@ -138,7 +102,7 @@ def _format_multisection(schedule, name_map, schedule_list):
 ###############################################################
 
 
-def _collapse_timeslot(schedule_list, name_map, schedule_qs):
+def _collapse_timeslot(schedule_list, name_map, section_counts):
     results = []
     seen = set()
     # collapse cross numbered courses -- same location, same instructor
@@ -165,7 +129,7 @@ def _collapse_timeslot(schedule_list, name_map, schedule_qs):
     for sched in schedule_list:
         if sched in seen:
             continue
-        results.append(_format_multisection(sched, name_map, schedule_qs))
+        results.append(_format_multisection(sched, name_map, section_counts))
         seen.add(sched)
     return sorted(results)
 
@@ -173,14 +137,14 @@ def _collapse_timeslot(schedule_list, name_map, schedule_qs):
 ###############################################################
 
 
-def _initial_display_table(timetable, name_map, schedule_list):
+def _initial_display_table(timetable, name_map, section_counts):
     # construct display timetable:
     display_timetable = {}
     for day in timetable:
         display_timetable[day] = {}
         for time in timetable[day]:
             display_timetable[day][time] = _collapse_timeslot(
-                timetable[day][time], name_map, schedule_list
+                timetable[day][time], name_map, section_counts
             )
     return display_timetable
 
@@ -259,17 +223,15 @@ def timetable(semester, time_formatter=None, schedule_types=None):
     """
     Generate the timetable for a semester.
     Lots of assumptions here....
+    The schedules are loaded once; everything after that is done in memory.
     """
     if schedule_types is None:
         schedule_types = ["Lecture", "Tutorial", "Laboratory", "Session"]
-    schedule_list = SectionSchedule.objects.active().filter(
-        section__term=semester,
-        section__course__department__advertised=True,
-        type__name__in=schedule_types,
-    )
+    schedule_qs = schedule_queryset(semester, schedule_types)
+    schedule_list = list(schedule_qs)
     t1 = preliminary_table(schedule_list)
-    name_map = _instructor_abbrev_map(schedule_list)
-    t2 = _initial_display_table(t1, name_map, schedule_list)
+    name_map = abbreviation_map(instructor_pk_set(schedule_list, schedule_qs))
+    t2 = _initial_display_table(t1, name_map, section_count_map(schedule_list))
     t3 = _display_timetable(t2, time_formatter=time_formatter)
     return t3
 
@@ -0,0 +1,149 @@
+"""
+A process-local registry of Semester rows.
+
+Semesters are looked up by ``(year, term)`` and by date all over the
+place (current term, loaders, templates), each time with a
+``get_or_create()`` round trip.  There are only a few dozen rows, so
+they are loaded once and resolved in memory; only missing semesters
+fall back to the database (and are created).
+
+The registry is reloaded when the version token changes, which happens
+whenever a Semester is saved or deleted (see ``classes.signals``), so
+every process sees changes made by any other.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+#######################
+
+VERSION_KEY = "classes:semesters:version"
+
+_registry = None
+_registry_lock = threading.Lock()
+
+#######################################################################
+
+
+def current_version():
+    """
+    Return the current version token of the semester registry.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """
+    Discard the loaded semesters (in every process).
+    """
+    global _registry
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    _registry = None
+
+
+def get_registry():
+    """
+    Return a ``SemesterRegistry`` for the current version;
+    the same one is reused until the version changes.
+    """
+    global _registry
+    version = current_version()
+    with _registry_lock:
+        if _registry is None or _registry.version != version:
+            _registry = SemesterRegistry(version)
+        return _registry
+
+
+def term_for_date(date):
+    """
+    Return the term code for the given date.
+    """
+    return str((date.month - 1) // 4 + 1)
+
+
+#######################################################################
+
+
+class SemesterRegistry(object):
+    """
+    All Semester rows, by ``(year, term)``.
+    Every lookup returns a new instance, so callers may modify it freely.
+    """
+
+    def __init__(self, version=None):
+        from ..models import Semester
+
+        if version is None:
+            version = current_version()
+        self.version = version
+        self.model = Semester
+        self._db = Semester.objects.db
+        self._field_names = [f.attname for f in Semester._meta.concrete_fields]
+        self._rows = {}
+        self._lock = threading.Lock()
+        for values in Semester.objects.order_by().values_list(*self._field_names):
+            self._add(values)
+
+    def _add(self, values):
+        row = dict(zip(self._field_names, values))
+        self._rows[row["year"], row["term"]] = values
+
+    def _instance(self, values):
+        return self.model.from_db(self._db, self._field_names, values)
+
+    def get(self, year, term):
+        """
+        Return the semester, or ``None`` if there is no such row.
+        """
+        values = self._rows.get((int(year), term))
+        if values is None:
+            return None
+        return self._instance(values)
+
+    def get_or_create(self, year, term, defaults=None):
+        """
+        Like ``Semester.objects.get_or_create(year=year, term=term)``;
+        the database is only used for missing semesters.
+        """
+        semester = self.get(year, term)
+        if semester is not None:
+            return semester, False
+        with self._lock:
+            semester, created = self.model.objects.get_or_create(
+                year=int(year), term=term, defaults=defaults
+            )
+        # only remember the row once it is committed; a rolled back
+        #   semester must not stay in the registry.
+        values = [getattr(semester, name) for name in self._field_names]
+        transaction.on_commit(lambda: self._add(values))
+        return semester, created
+
+    def get_by_date(self, date):
+        """
+        Return the semester for the given date, creating it if necessary.
+        """
+        semester, created = self.get_or_create(date.year, term_for_date(date))
+        return semester
+
+    def pk_list(self, predicate):
+        """
+        Return the primary keys of the semesters ``s`` for which
+        ``predicate(s)`` is true.
+        """
+        return [
+            semester.pk
+            for semester in map(self._instance, self._rows.values())
+            if predicate(semester)
+        ]
+
+
+#######################################################################
@@ -0,0 +1,51 @@
+"""
+A content-addressed cache of graphviz renderings.
+
+The rendered ``.dot`` source fully determines the output, so results are
+cached keyed on a digest of the source (and the layout options); a cached
+rendering never goes stale and nothing needs invalidating.  Rendering
+spawns a ``dot`` process, so the advertised course maps can be rendered
+ahead of time with the ``render_course_graphs`` command.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import hashlib
+
+import graphviz
+from django.core.cache import cache
+
+from .. import conf
+
+#######################################################################
+
+
+def cache_key(source, engine="dot", format="svg", renderer=None, formatter=None):
+    """
+    The cache key for a rendering of the ``source`` (bytes).
+    """
+    digest = hashlib.sha1(source)
+    digest.update(
+        "\0{0}\0{1}\0{2}\0{3}".format(engine, format, renderer, formatter).encode(
+            "utf-8"
+        )
+    )
+    return "classes:graphviz:{0}".format(digest.hexdigest())
+
+
+def pipe(engine, format, source, renderer=None, formatter=None):
+    """
+    Like ``graphviz.pipe()``, but only spawns ``engine`` when this exact
+    ``source`` has not been rendered before.
+    """
+    key = cache_key(source, engine, format, renderer, formatter)
+    result = cache.get(key)
+    if result is None:
+        result = graphviz.pipe(
+            engine, format, source, renderer=renderer, formatter=formatter
+        )
+        cache.set(key, result, conf.get("graphviz:cache_timeout"))
+    return result
+
+
+#######################################################################
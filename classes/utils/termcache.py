@@ -0,0 +1,132 @@
+"""
+A cache namespace for each term.
+
+Every key includes the term's generation token; ``invalidate()`` replaces
+the token, so everything cached for the term becomes unreachable at once
+and a stale schedule is never served.  The token also includes a shared
+generation, which ``invalidate_all()`` replaces, for the rows (courses,
+timeslots, rooms, people, ...) that are displayed in every term.
+Generations are replaced by the signals on the models which are cached
+(see ``classes.signals``), and explicitly by bulk operations which bypass
+the signals.
+"""
+#######################
+from __future__ import print_function, unicode_literals
+
+import uuid
+
+from django.core.cache import cache
+
+from .. import conf
+
+#######################
+
+GENERATION_KEY = "classes:term:{0}:generation"
+SHARED_GENERATION_KEY = "classes:term:generation"
+
+# How to get from a row to its term id, for the models that are cached
+#   by term.
+TERM_LOOKUPS = {
+    "classes.semester": "pk",
+    "classes.section": "term_id",
+    "classes.sectionschedule": "section__term_id",
+    "classes.enrollment": "section__term_id",
+    "classes.sectionhandout": "section__term_id",
+    "classes.semesterdaterange": "semester_id",
+    "exams.exam": "section__term_id",
+}
+
+# The models which are cached for every term.
+SHARED_MODELS = (
+    "classes.course",
+    "classes.department",
+    "classes.scheduletype",
+    "classes.timeslot",
+    "people.person",
+    "places.classroom",
+)
+
+#######################################################################
+
+
+def _token(key):
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        value = cache.get(key)
+    return value
+
+
+def generation(term_id):
+    """
+    Return the current generation token for the term.
+    """
+    return "{0}.{1}".format(
+        _token(SHARED_GENERATION_KEY), _token(GENERATION_KEY.format(term_id))
+    )
+
+
+def invalidate(*term_ids):
+    """
+    Discard everything cached for the given terms.
+    """
+    cache.set_many(
+        {GENERATION_KEY.format(term_id): uuid.uuid4().hex for term_id in term_ids},
+        None,
+    )
+
+
+def invalidate_all():
+    """
+    Discard everything cached for every term.
+    """
+    cache.set(SHARED_GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_queryset(queryset):
+    """
+    Discard everything cached for the terms of the rows in ``queryset``;
+    for use with ``QuerySet.update()``, which does not send signals.
+    Querysets of other models are ignored.
+    """
+    label = queryset.model._meta.label_lower
+    if label in SHARED_MODELS:
+        invalidate_all()
+        return
+    lookup = TERM_LOOKUPS.get(label)
+    if lookup is None:
+        return
+    term_ids = set(queryset.order_by().values_list(lookup, flat=True))
+    if term_ids:
+        invalidate(*term_ids)
+
+
+#######################################################################
+
+
+def make_key(term_id, *parts):
+    """
+    Return the cache key for ``parts`` in the current generation of
+    the term.
+    """
+    return "classes:term:{0}:{1}:{2}".format(
+        term_id, generation(term_id), ":".join("{}".format(p) for p in parts)
+    )
+
+
+def get_or_set(term_id, parts, func, timeout=None):
+    """
+    Return the cached value for ``parts`` in the term, computing
+    and storing ``func()`` if there is none.
+    """
+    if timeout is None:
+        timeout = conf.get("term_cache:timeout")
+    key = make_key(term_id, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = func()
+        cache.set(key, value, timeout)
+    return value
+
+
+#######################################################################
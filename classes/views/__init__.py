@@ -7,9 +7,9 @@ from __future__ import print_function, unicode_literals
 
 import datetime
 
-import graphviz  # could be replace with subprocess call.
 from django.apps import apps
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.template.response import TemplateResponse
@@ -22,13 +22,17 @@ from latex.djangoviews import LaTeXDetailView, LaTeXListView
 from .. import conf
 from ..models import (
     Course,
+    CourseHandout,
     Department,
+    Prerequisite,
     Requisite,
     Section,
     SectionHandout,
     SectionSchedule,
     Semester,
 )
+from ..utils import svgcache, termcache
+from ..utils.conditional import ConditionalGetMixin
 from ..utils.print_timetable import latex_tabular_list
 
 #######################################################################
@@ -67,13 +71,24 @@ department_detail = DepartmentDetailView.as_view()
 #######################################################################
 
 
-class SemesterMixin(object):
+class SemesterMixin(ConditionalGetMixin):
     """
     Mixin for Department views.
     """
 
     queryset = Semester.objects.active()
 
+    def get_dependent_querysets(self):
+        semesters = self.get_queryset()
+        if "slug" in self.kwargs:
+            semesters = semesters.filter(slug=self.kwargs["slug"])
+        return [
+            semesters,
+            Section.objects.filter(term__in=semesters),
+            SectionSchedule.objects.filter(section__term__in=semesters),
+            SectionHandout.objects.filter(section__term__in=semesters),
+        ]
+
 
 #######################################################################
 
@@ -139,13 +154,23 @@ section_semester_detail = SectionSemesterDetailView.as_view()
 #######################################################################
 
 
-class SectionMixin(object):
+class SectionMixin(ConditionalGetMixin):
     """
     Mixin for Section views.
     """
 
     queryset = Section.objects.active_terms()
 
+    def get_dependent_querysets(self):
+        sections = self.get_queryset()
+        if "slug" in self.kwargs:
+            sections = sections.filter(slug=self.kwargs["slug"])
+        return [
+            sections,
+            SectionSchedule.objects.filter(section__in=sections),
+            SectionHandout.objects.filter(section__in=sections),
+        ]
+
 
 #######################################################################
 
@@ -178,6 +203,12 @@ class SemesterCourseDetailView(SectionMixin, ListView):
         context.update({"course": course, "semester": semester})
         return context
 
+    def get_dependent_querysets(self):
+        return super().get_dependent_querysets() + [
+            Course.objects.filter(slug=self.kwargs.get("course_slug", None)),
+            Semester.objects.filter(slug=self.kwargs.get("term_slug", None)),
+        ]
+
 
 semester_course_detail = SemesterCourseDetailView.as_view()
 
@@ -311,13 +342,16 @@ classroom_detail = ClassRoomDetailView.as_view()
 #######################################################################
 
 
-class CourseDetailView(DetailView):
+class CourseDetailView(ConditionalGetMixin, DetailView):
 
     queryset = Course.objects.active().select_related("department")
     template_name = "classes/course_detail.html"
     context_object_name = "course"
 
     def get_object(self):
+        # the conditional get needs the course too; look it up once.
+        if getattr(self, "_course", None) is not None:
+            return self._course
         if "slug" in self.kwargs:
             slug = self.kwargs["slug"]
         else:
@@ -328,8 +362,24 @@ class CourseDetailView(DetailView):
             obj = Course.objects.get_by_slug(slug)
         except Course.DoesNotExist:
             raise Http404("Course not found")
+        self._course = obj
         return obj
 
+    def get_dependent_querysets(self):
+        course = self.get_object()
+        sections = Section.objects.filter(course=course)
+        return [
+            Course.objects.filter(pk=course.pk),
+            Department.objects.filter(pk=course.department_id),
+            sections,
+            Semester.objects.filter(pk__in=sections.values("term_id")),
+            SectionSchedule.objects.filter(section__course=course),
+            SectionHandout.objects.filter(section__course=course),
+            CourseHandout.objects.filter(course=course),
+            Requisite.objects.filter(course=course),
+            Prerequisite.objects.filter(Q(course=course) | Q(requisite__course=course)),
+        ]
+
 
 course_details = CourseDetailView.as_view()
 
@@ -346,7 +396,7 @@ class GraphvizTemplateResponse(TemplateResponse):
     @property
     def rendered_content(self):
         source = super().rendered_content
-        return graphviz.pipe(
+        return svgcache.pipe(
             self.engine,
             self.format,
             source.encode("utf-8"),
@@ -404,7 +454,7 @@ class CourseListSvgView(ListView):
 #######################################################################
 
 
-class CourseListView(ListView):
+class CourseListView(ConditionalGetMixin, ListView):
     queryset = Course.objects.active().filter(department__public=True)
 
 
@@ -413,7 +463,7 @@ course_list = CourseListView.as_view()
 #######################################################################
 
 
-class AdvertisedCourseListView(ListView):
+class AdvertisedCourseListView(ConditionalGetMixin, ListView):
     queryset = Course.objects.active().filter(
         department__public=True, department__advertised=True
     )
@@ -424,13 +474,17 @@ advertised_course_list = AdvertisedCourseListView.as_view()
 #######################################################################
 
 
-class AdvertisedSectionListView(ListView):
+class AdvertisedSectionListView(ConditionalGetMixin, ListView):
 
     queryset = Section.objects.filter(
         active=True, course__department__advertised=True, term__advertised=True
     ).select_related("course", "course__department", "term")
     template_name = "classes/section_list.html"
 
+    def get_dependent_querysets(self):
+        sections = self.get_queryset()
+        return [sections, SectionSchedule.objects.filter(section__in=sections)]
+
 
 advertised_section_list = AdvertisedSectionListView.as_view()
 
@@ -611,8 +665,12 @@ class PrintTimetable(LaTeXDetailView):
         context = super(PrintTimetable, self).get_context_data(*args, **kwargs)
         context.update(
             {
-                "tabular_list": latex_tabular_list(
-                    self.object, schedule_types=self.schedule_types
+                "tabular_list": termcache.get_or_set(
+                    self.object.pk,
+                    ["timetable", ",".join(self.schedule_types or [])],
+                    lambda: latex_tabular_list(
+                        self.object, schedule_types=self.schedule_types
+                    ),
                 )
             }
         )
@@ -0,0 +1,136 @@
+"""
+Streaming iCalendar views for the classes application.
+"""
+#######################################################################
+
+from __future__ import print_function, unicode_literals
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.generic.base import View
+
+from ..models import (
+    ImportantDate,
+    Section,
+    SectionSchedule,
+    Semester,
+    SemesterDateRange,
+    Timeslot,
+)
+from ..utils.conditional import ConditionalGetMixin
+from ..utils.ical import iter_icalendar, object_vevents
+
+#######################################################################
+
+
+class ICalendarStreamView(ConditionalGetMixin, View):
+    """
+    Stream the events of every object in the queryset as an
+    iCalendar file.
+    """
+
+    queryset = None
+    include_section_events = False
+    calendar_name = None
+
+    def get_queryset(self):
+        if self.queryset is None:
+            raise ImproperlyConfigured(
+                "{0} is missing a queryset.".format(self.__class__.__name__)
+            )
+        return self.queryset.all()
+
+    def get_calendar_name(self):
+        return self.calendar_name
+
+    def get_events(self, obj):
+        return object_vevents(obj, include_section_events=self.include_section_events)
+
+    def get(self, request, *args, **kwargs):
+        object_list = self.get_queryset().iterator()
+        return StreamingHttpResponse(
+            iter_icalendar(object_list, self.get_events, self.get_calendar_name()),
+            content_type="text/calendar; charset=utf-8",
+        )
+
+
+#######################################################################
+
+
+class ScheduleCalendarMixin(object):
+    """
+    Fetch everything ``SectionSchedule.vevent_list()`` uses up front.
+    """
+
+    def schedule_queryset(self):
+        return SectionSchedule.objects.active().select_related(
+            "section__course__department",
+            "section__instructor",
+            "timeslot",
+            "date_range",
+            "room",
+            "instructor",
+        )
+
+    def get_dependent_querysets(self):
+        schedules = self.get_queryset()
+        return [
+            schedules,
+            Section.objects.filter(sectionschedule__in=schedules),
+            ImportantDate.objects.filter(no_class=True),
+            SemesterDateRange.objects.all(),
+            Timeslot.objects.all(),
+        ]
+
+
+#######################################################################
+
+
+class ImportantDatesCalendar(ICalendarStreamView):
+    queryset = ImportantDate.objects.active()
+    calendar_name = "Important dates"
+
+
+important_dates_calendar = ImportantDatesCalendar.as_view()
+
+#######################################################################
+
+
+class SectionCalendar(ScheduleCalendarMixin, ICalendarStreamView):
+    """
+    The classes of a single section.
+    """
+
+    def get_queryset(self):
+        self.section = get_object_or_404(Section, pk=self.kwargs["object_id"])
+        return self.schedule_queryset().filter(section=self.section)
+
+    def get_calendar_name(self):
+        return "{}".format(self.section)
+
+
+section_calendar = SectionCalendar.as_view()
+
+#######################################################################
+
+
+class SemesterCalendar(ScheduleCalendarMixin, ICalendarStreamView):
+    """
+    The classes of every advertised section in a term.
+    """
+
+    def get_queryset(self):
+        self.semester = get_object_or_404(Semester, slug=self.kwargs["slug"])
+        return self.schedule_queryset().filter(
+            section__term=self.semester,
+            section__course__department__advertised=True,
+        )
+
+    def get_calendar_name(self):
+        return "{}".format(self.semester)
+
+
+semester_calendar = SemesterCalendar.as_view()
+
+#######################################################################
@@ -3,9 +3,10 @@ from django.shortcuts import get_object_or_404
 from django.views.generic import DetailView, ListView
 
 from ..models import Course, Enrollment, Section, Semester
+from ..utils.conditional import ConditionalGetMixin
 
 
-class EnrollmentForTerm(ListView):
+class EnrollmentForTerm(ConditionalGetMixin, ListView):
     """
     A List of enrollment information for the term
     """
@@ -21,13 +22,25 @@ class EnrollmentForTerm(ListView):
         qs = qs.filter(section__term__slug=term_slug, section__course__slug=course_slug)
         return qs
 
+    def get_dependent_querysets(self):
+        enrollments = self.get_queryset()
+        return [
+            enrollments,
+            Section.objects.filter(
+                term__slug=self.kwargs.get("term_slug"),
+                course__slug=self.kwargs.get("course_slug"),
+            ),
+        ]
+
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
         context["course"] = get_object_or_404(
             Course, slug=self.kwargs.get("course_slug")
         )
         context["term"] = get_object_or_404(Semester, slug=self.kwargs.get("term_slug"))
-        context["section_list"] = Section.objects.filter(
-            course=context["course"], term=context["term"]
-        ).active()
+        context["section_list"] = (
+            Section.objects.filter(course=context["course"], term=context["term"])
+            .active()
+            .with_enrollment()
+        )
         return context